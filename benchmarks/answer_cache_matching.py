@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Answer Cache Matching Check
+Stores a chatbot answer for one question and looks up another about the same
+prescription, failing when a question that needs a different answer (other
+dose, negated, before/after) is served the cached one, or when a harmless
+rephrasing misses.
+
+Usage:
+    python -m benchmarks.answer_cache_matching
+"""
+
+import sys
+
+from services.answer_cache import AnswerCache
+
+PRESCRIPTION = {
+    "1": {"name": "Napa", "strength": "500 mg", "dosage_type": "Tablet"},
+    "2": {"name": "Sergel", "strength": "20 mg", "dosage_type": "Capsule"},
+}
+
+# (cached question, asked question, should the cached answer be reused?)
+CASES = [
+    ("Can I take Napa with alcohol?", "Can I take Napa without alcohol?", False),
+    ("Can I take Napa without alcohol?", "Can I take Napa with alcohol?", False),
+    ("What is the dose of sergel 20", "What is the dose of sergel 40", False),
+    ("dose of napa 500", "dose of napa 250", False),
+    ("Should I take Sergel before meals?", "Should I take Sergel after meals?", False),
+    ("Can I take Napa at night?", "Can't I take Napa at night?", False),
+    ("Is Napa safe in pregnancy?", "Is Napa not safe in pregnancy?", False),
+    ("Side effects of Napa?", "side effects of napa", True),
+    ("What are the side effects of Napa?", "What are the side-effects of Napa", True),
+    ("What is the dose of Napa 500?", "what is the napa 500 dose", True),
+    ("Can I take Napa without food?", "Can I take Napa without any food?", True),
+]
+
+
+def check_answer_cache_matching():
+    """Returns a list of failure descriptions"""
+    failures = []
+    for cached_question, asked_question, should_match in CASES:
+        cache = AnswerCache(ttl=3600, max_entries=100)
+        cache.set(PRESCRIPTION, cached_question, "cached answer")
+        matched = cache.get(PRESCRIPTION, asked_question) is not None
+        if matched != should_match:
+            expectation = "reuse" if should_match else "not reuse"
+            failures.append(f"{asked_question!r} should {expectation} the answer for {cached_question!r}")
+    return failures
+
+
+def main():
+    failures = check_answer_cache_matching()
+    if failures:
+        for failure in failures:
+            print(f"FAIL {failure}")
+        print(f"\n{len(failures)} of {len(CASES)} answer cache cases failed")
+        sys.exit(1)
+    print(f"All {len(CASES)} answer cache cases passed")
+
+
+if __name__ == "__main__":
+    main()
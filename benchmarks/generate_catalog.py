@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Synthetic Catalog Generator
+Builds a seeded, realistic-looking medicine catalog for load benchmarks.
+
+Usage:
+    python -m benchmarks.generate_catalog --rows 100000 --seed 42
+    DATABASE_URL=sqlite:///./benchmarks/data/catalog_100000.db uvicorn main:app
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import time
+
+from sqlalchemy import create_engine
+
+from indexes import ensure_indexes
+from models import Base, Medicine, LOOKUP_FIELDS
+
+# Well known manufacturers get most of the catalog, the rest is a long tail
+HEAD_MANUFACTURERS = [
+    "Square Pharmaceuticals Ltd.", "Incepta Pharmaceuticals Ltd.", "Beximco Pharmaceuticals Ltd.",
+    "ACME Laboratories Ltd.", "Renata Limited", "Eskayef Pharmaceuticals Ltd.",
+    "Opsonin Pharma Limited", "Healthcare Pharmaceuticals Ltd.", "Aristopharma Ltd.",
+    "Drug International Ltd.", "ACI Limited", "Radiant Pharmaceuticals Ltd.",
+    "General Pharmaceuticals Ltd.", "Popular Pharmaceuticals Ltd.", "Ziska Pharmaceuticals Ltd.",
+    "Navana Pharmaceuticals Ltd.", "Globe Pharmaceuticals Ltd.", "Ibn Sina Pharmaceuticals Ltd.",
+    "Sanofi Bangladesh Limited", "Novartis (Bangladesh) Ltd.",
+]
+TAIL_PREFIXES = [
+    "Al-Madina", "Amico", "Apex", "Bengal", "Biopharma", "Concord", "Delta", "Edruc",
+    "Everest", "Gaco", "Globex", "Hudson", "Jayson", "Kumudini", "Labaid", "Medimet",
+    "Millat", "Nipro", "Orion", "Pacific", "Pharmasia", "Rangs", "Sharif", "Silva",
+    "Skylab", "Sunman", "Supreme", "Techno", "Unimed", "Veritas", "White Horse", "Zenith",
+]
+TAIL_SUFFIXES = ["Pharmaceuticals Ltd.", "Laboratories Ltd.", "Pharma Limited", "Herbal Ltd.", "Healthcare Ltd."]
+
+# (generic, [(dosage_form, strength), ...])
+GENERICS = [
+    ("Paracetamol", [("Tablet", "500 mg"), ("Tablet", "665 mg"), ("Syrup", "120 mg/5 ml"), ("Suppository", "125 mg")]),
+    ("Omeprazole", [("Capsule", "20 mg"), ("Capsule", "40 mg"), ("Injection", "40 mg/vial")]),
+    ("Esomeprazole", [("Tablet", "20 mg"), ("Tablet", "40 mg"), ("Powder for Suspension", "20 mg/sachet")]),
+    ("Pantoprazole", [("Tablet", "20 mg"), ("Tablet", "40 mg"), ("Injection", "40 mg/vial")]),
+    ("Amoxicillin Trihydrate", [("Capsule", "250 mg"), ("Capsule", "500 mg"), ("Powder for Suspension", "125 mg/5 ml")]),
+    ("Cefixime Trihydrate", [("Capsule", "200 mg"), ("Capsule", "400 mg"), ("Powder for Suspension", "100 mg/5 ml")]),
+    ("Cefuroxime Axetil", [("Tablet", "250 mg"), ("Tablet", "500 mg"), ("Powder for Suspension", "125 mg/5 ml")]),
+    ("Ceftriaxone Sodium", [("Injection", "250 mg/vial"), ("Injection", "500 mg/vial"), ("Injection", "1 gm/vial")]),
+    ("Azithromycin Dihydrate", [("Tablet", "500 mg"), ("Capsule", "250 mg"), ("Powder for Suspension", "200 mg/5 ml")]),
+    ("Ciprofloxacin", [("Tablet", "250 mg"), ("Tablet", "500 mg"), ("Eye Drop", "0.3%")]),
+    ("Levofloxacin", [("Tablet", "500 mg"), ("Tablet", "750 mg"), ("Infusion", "500 mg/100 ml")]),
+    ("Metronidazole", [("Tablet", "400 mg"), ("Suspension", "200 mg/5 ml"), ("Infusion", "500 mg/100 ml")]),
+    ("Cloxacillin Sodium", [("Capsule", "500 mg"), ("Injection", "500 mg/vial"), ("Powder for Suspension", "125 mg/5 ml")]),
+    ("Flucloxacillin", [("Capsule", "250 mg"), ("Capsule", "500 mg"), ("Powder for Suspension", "125 mg/5 ml")]),
+    ("Metformin Hydrochloride", [("Tablet", "500 mg"), ("Tablet", "850 mg"), ("Tablet (Extended Release)", "1000 mg")]),
+    ("Gliclazide", [("Tablet", "80 mg"), ("Tablet (Modified Release)", "30 mg"), ("Tablet (Modified Release)", "60 mg")]),
+    ("Sitagliptin", [("Tablet", "50 mg"), ("Tablet", "100 mg")]),
+    ("Insulin Human", [("Injection", "100 IU/ml")]),
+    ("Amlodipine", [("Tablet", "5 mg"), ("Tablet", "10 mg")]),
+    ("Losartan Potassium", [("Tablet", "25 mg"), ("Tablet", "50 mg"), ("Tablet", "100 mg")]),
+    ("Bisoprolol Fumarate", [("Tablet", "2.5 mg"), ("Tablet", "5 mg")]),
+    ("Atenolol", [("Tablet", "25 mg"), ("Tablet", "50 mg")]),
+    ("Atorvastatin", [("Tablet", "10 mg"), ("Tablet", "20 mg"), ("Tablet", "40 mg")]),
+    ("Rosuvastatin", [("Tablet", "5 mg"), ("Tablet", "10 mg"), ("Tablet", "20 mg")]),
+    ("Clopidogrel", [("Tablet", "75 mg")]),
+    ("Aspirin", [("Tablet", "75 mg"), ("Tablet", "300 mg")]),
+    ("Montelukast", [("Tablet", "10 mg"), ("Chewable Tablet", "4 mg"), ("Chewable Tablet", "5 mg")]),
+    ("Fexofenadine Hydrochloride", [("Tablet", "120 mg"), ("Tablet", "180 mg"), ("Suspension", "30 mg/5 ml")]),
+    ("Desloratadine", [("Tablet", "5 mg"), ("Syrup", "2.5 mg/5 ml")]),
+    ("Cetirizine Hydrochloride", [("Tablet", "10 mg"), ("Syrup", "5 mg/5 ml")]),
+    ("Salbutamol", [("Tablet", "4 mg"), ("Syrup", "2 mg/5 ml"), ("Inhaler", "100 mcg/puff")]),
+    ("Bromhexine Hydrochloride", [("Tablet", "8 mg"), ("Syrup", "4 mg/5 ml")]),
+    ("Ambroxol Hydrochloride", [("Tablet", "30 mg"), ("Syrup", "15 mg/5 ml"), ("Pediatric Drops", "6 mg/ml")]),
+    ("Dextromethorphan + Pseudoephedrine + Triprolidine", [("Syrup", "(10 mg+30 mg+1.25 mg)/5 ml")]),
+    ("Domperidone", [("Tablet", "10 mg"), ("Suspension", "5 mg/5 ml"), ("Pediatric Drops", "5 mg/ml")]),
+    ("Ondansetron", [("Tablet", "4 mg"), ("Tablet", "8 mg"), ("Injection", "8 mg/4 ml")]),
+    ("Ranitidine", [("Tablet", "150 mg"), ("Injection", "50 mg/2 ml")]),
+    ("Naproxen", [("Tablet", "250 mg"), ("Tablet", "500 mg")]),
+    ("Diclofenac Sodium", [("Tablet", "50 mg"), ("Tablet (Sustained Release)", "100 mg"), ("Gel", "1%")]),
+    ("Ketorolac Tromethamine", [("Tablet", "10 mg"), ("Injection", "30 mg/ml")]),
+    ("Tramadol Hydrochloride", [("Capsule", "50 mg"), ("Injection", "100 mg/2 ml")]),
+    ("Prednisolone", [("Tablet", "5 mg"), ("Tablet", "10 mg"), ("Tablet", "20 mg")]),
+    ("Dexamethasone", [("Tablet", "0.5 mg"), ("Injection", "5 mg/ml")]),
+    ("Levothyroxine Sodium", [("Tablet", "25 mcg"), ("Tablet", "50 mcg"), ("Tablet", "100 mcg")]),
+    ("Calcium Carbonate + Vitamin D3", [("Tablet", "500 mg+200 IU"), ("Tablet", "600 mg+400 IU")]),
+    ("Ferrous Fumarate + Folic Acid", [("Capsule", "200 mg+0.2 mg")]),
+    ("Zinc Sulfate", [("Tablet", "20 mg"), ("Syrup", "10 mg/5 ml")]),
+    ("Vitamin B1 + B6 + B12", [("Tablet", "100 mg+200 mg+200 mcg"), ("Injection", "100 mg+100 mg+1 mg/3 ml")]),
+    ("Fluconazole", [("Capsule", "50 mg"), ("Capsule", "150 mg")]),
+    ("Clotrimazole", [("Cream", "1%"), ("Vaginal Tablet", "500 mg")]),
+    ("Mebendazole", [("Tablet", "100 mg"), ("Suspension", "100 mg/5 ml")]),
+    ("Albendazole", [("Tablet", "400 mg"), ("Suspension", "200 mg/5 ml")]),
+    ("Sertraline", [("Tablet", "50 mg")]),
+    ("Escitalopram", [("Tablet", "5 mg"), ("Tablet", "10 mg")]),
+    ("Clonazepam", [("Tablet", "0.5 mg"), ("Tablet", "2 mg")]),
+    ("Olanzapine", [("Tablet", "5 mg"), ("Tablet", "10 mg")]),
+    ("Oral Rehydration Salts", [("Powder", "10.25 gm/sachet")]),
+    ("Chlorhexidine Gluconate", [("Mouthwash", "0.2%"), ("Solution", "4%")]),
+]
+HERBAL_GENERICS = [
+    ("Ashwagandha", [("Capsule", "500 mg"), ("Powder", "100 gm")]),
+    ("Tulsi Extract", [("Syrup", "100 ml"), ("Capsule", "250 mg")]),
+    ("Ispaghula Husk", [("Powder", "3.5 gm/sachet")]),
+    ("Basak Leaf Extract", [("Syrup", "100 ml")]),
+    ("Neem Extract", [("Capsule", "250 mg"), ("Cream", "25 gm")]),
+]
+OTHER_TYPES = [("herbal", 5), ("ayurvedic", 2), ("unani", 2), ("homeopathic", 1)]
+
+BRAND_ONSETS = ["A", "Ace", "Al", "Am", "Bex", "Ce", "Cef", "Ci", "Da", "De", "Do", "E", "Fe", "Fix",
+                "Ga", "Lo", "Ma", "Max", "Mo", "Na", "Neo", "Ni", "O", "Pro", "Ra", "Re", "Sec", "Ta",
+                "To", "Ult", "Vi", "Xe", "Ze", "Zi"]
+BRAND_CODAS = ["bac", "cef", "cin", "clox", "cof", "cold", "dol", "fen", "lor", "mex", "mox", "nac",
+               "nor", "pa", "pro", "ra", "ril", "sin", "tec", "tin", "tor", "trol", "vir", "xim", "zol"]
+BRAND_MARKS = ["", "", "", "", " Plus", " DS", " XR", " Forte", " Kids"]
+
+PACKAGES = {
+    "Tablet": ("10 x 10: ৳ {price}", "100's pack", 1.0),
+    "Capsule": ("5 x 6: ৳ {price}", "30's pack", 1.2),
+    "Syrup": ("100 ml bottle: ৳ {price}", "100 ml", 0.8),
+    "Suspension": ("60 ml bottle: ৳ {price}", "60 ml", 0.9),
+    "Powder for Suspension": ("100 ml bottle: ৳ {price}", "100 ml", 0.9),
+    "Injection": ("1 vial: ৳ {price}", "1 vial", 1.5),
+    "Infusion": ("100 ml bag: ৳ {price}", "100 ml", 2.0),
+}
+DEFAULT_PACKAGE = ("1 pack: ৳ {price}", "1 pack", 1.0)
+
+
+def slugify(*parts):
+    """Build a slug the same way the source catalog does"""
+    return "".join(re.sub(r"[^a-z0-9]+", "-", str(part).lower()).strip("-") for part in parts)
+
+
+def build_manufacturers(rng, count):
+    """Head manufacturers followed by a generated long tail"""
+    names = list(HEAD_MANUFACTURERS)
+    seen = set(names)
+    while len(names) < count:
+        name = f"{rng.choice(TAIL_PREFIXES)} {rng.choice(TAIL_SUFFIXES)}"
+        if name in seen:
+            name = f"{rng.choice(TAIL_PREFIXES)} {rng.choice(TAIL_PREFIXES)} {rng.choice(TAIL_SUFFIXES)}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def zipf_weights(count, exponent=1.1):
+    """Weights for a Zipf-like skew over `count` ranked items"""
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def generate_rows(rows, seed=42, manufacturers=300):
+    """Yield medicine dictionaries for a catalog of `rows` entries"""
+    rng = random.Random(seed)
+    manufacturer_names = build_manufacturers(rng, manufacturers)
+    manufacturer_weights = zipf_weights(len(manufacturer_names))
+    generic_weights = zipf_weights(len(GENERICS), exponent=0.8)
+    other_types = [t for t, _ in OTHER_TYPES]
+    other_weights = [w for _, w in OTHER_TYPES]
+
+    for index in range(rows):
+        if rng.random() < 0.08:
+            medicine_type = rng.choices(other_types, other_weights)[0]
+            generic, forms = rng.choice(HERBAL_GENERICS)
+        else:
+            medicine_type = "allopathic"
+            generic, forms = rng.choices(GENERICS, generic_weights)[0]
+        dosage_form, strength = rng.choice(forms)
+        brand_name = f"{rng.choice(BRAND_ONSETS)}{rng.choice(BRAND_CODAS)}{rng.choice(BRAND_MARKS)}"
+        container, package_size, multiplier = PACKAGES.get(dosage_form, DEFAULT_PACKAGE)
+        price = round(rng.lognormvariate(3.4, 0.9) * multiplier, 2)
+
+        yield {
+            "id": index + 1,
+            "brand_id": 1000 + index,
+            "brand_name": brand_name,
+            "type": medicine_type,
+            "slug": slugify(brand_name, dosage_form, strength),
+            "dosage_form": dosage_form,
+            "generic": generic,
+            "strength": strength,
+            "manufacturer": rng.choices(manufacturer_names, manufacturer_weights)[0],
+            "package_container": container.format(price=f"{price:.2f}"),
+            "package_size": package_size,
+            "price": price,
+        }
+
+
+def write_catalog(db_path, rows, seed=42, batch_size=50000):
+    """Create `db_path` with the app schema and fill it with `rows` medicines"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    # Let the models define the schema; indexes are built after the load
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+
+    columns = [column.name for column in Medicine.__table__.columns]
+    insert_sql = (
+        f"INSERT INTO {Medicine.__tablename__} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    # Lookup name -> key, assigned in order of first appearance
+    lookup_ids = {field: {} for field in LOOKUP_FIELDS}
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    batch = []
+    for row in generate_rows(rows, seed=seed):
+        for field, ids in lookup_ids.items():
+            row[f"{field}_id"] = ids.setdefault(row[field], len(ids) + 1)
+        batch.append(tuple(row[column] for column in columns))
+        if len(batch) >= batch_size:
+            conn.executemany(insert_sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(insert_sql, batch)
+    for field, ids in lookup_ids.items():
+        conn.executemany(
+            f"INSERT INTO {LOOKUP_FIELDS[field].__tablename__} (id, name) VALUES (?, ?)",
+            [(key, name) for name, key in ids.items()],
+        )
+    conn.commit()
+    conn.close()
+
+    # Builds the production index set and runs ANALYZE
+    ensure_indexes(engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic medicine catalog")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of medicines (10k-1M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="Output SQLite file (default: benchmarks/data/catalog_<rows>.db)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join("benchmarks", "data", f"catalog_{args.rows}.db")
+    started = time.perf_counter()
+    write_catalog(db_path, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows} medicines to {db_path} in {time.perf_counter() - started:.1f}s")
+    print(f"Serve it with: DATABASE_URL=sqlite:///{os.path.abspath(db_path)} uvicorn main:app")
+
+
+if __name__ == "__main__":
+    main()
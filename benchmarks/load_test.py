@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - API Load Benchmark
+Drives every /api/* endpoint with a weighted query mix and records latency percentiles.
+
+Usage:
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --duration 30
+    python -m benchmarks.load_test --baseline benchmarks/results/baseline.json
+
+Results are written as JSON to benchmarks/results/. When --baseline is given the run
+fails (exit code 1) if any scenario's p95 regresses beyond the allowed tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.generate_catalog import GENERICS
+
+SEARCH_SORTS = ["brand_name", "price", "generic", "manufacturer"]
+PRICE_BANDS = [(0, 25), (25, 100), (100, 500), (500, None)]
+
+
+class Workload:
+    """Catalog values sampled from the running server to build realistic requests"""
+
+    def __init__(self, brand_names, generics, types, dosage_forms, max_id):
+        self.brand_names = brand_names or ["Napa"]
+        self.generics = generics or [generic for generic, _ in GENERICS]
+        self.types = types or ["allopathic"]
+        self.dosage_forms = dosage_forms or ["Tablet"]
+        self.max_id = max(max_id, 1)
+        self.created_ids = []
+
+    @classmethod
+    async def discover(cls, client):
+        filters = (await client.get("/api/filters")).json()
+        listing = (await client.get("/api/medicines", params={"limit": 1000})).json()
+        medicines = listing.get("medicines", [])
+        return cls(
+            brand_names=sorted({m["brand_name"] for m in medicines if m.get("brand_name")}),
+            generics=sorted({m["generic"] for m in medicines if m.get("generic")}),
+            types=filters.get("types", []),
+            dosage_forms=filters.get("dosage_forms", []),
+            max_id=listing.get("total", 0),
+        )
+
+
+# Scenario builders return (method, path, params, json_body)
+
+def list_medicines(w, rng):
+    return "GET", "/api/medicines", {"skip": rng.randrange(0, 50) * 100, "limit": 100}, None
+
+
+def search_brand_prefix(w, rng):
+    name = rng.choice(w.brand_names)
+    return "GET", "/api/medicines/search", {"query": name[:rng.randint(2, 4)]}, None
+
+
+def search_brand_exact(w, rng):
+    return "GET", "/api/medicines/search", {"query": rng.choice(w.brand_names)}, None
+
+
+def search_generic(w, rng):
+    generic = rng.choice(w.generics)
+    return "GET", "/api/medicines/search", {"query": generic.split()[0], "search_type": "generic_name"}, None
+
+
+def search_filtered(w, rng):
+    params = {"type": rng.choice(w.types), "dosage_form": rng.choice(w.dosage_forms),
+              "sort_by": rng.choice(SEARCH_SORTS), "sort_order": rng.choice(["asc", "desc"])}
+    return "GET", "/api/medicines/search", params, None
+
+
+def search_price_range(w, rng):
+    low, high = rng.choice(PRICE_BANDS)
+    params = {"min_price": low, "sort_by": "price"}
+    if high is not None:
+        params["max_price"] = high
+    return "GET", "/api/medicines/search", params, None
+
+
+def search_deep_page(w, rng):
+    return "GET", "/api/medicines/search", {"page": rng.randint(50, 500), "per_page": 20}, None
+
+
+def get_medicine(w, rng):
+    return "GET", f"/api/medicines/{rng.randint(1, w.max_id)}", None, None
+
+
+def statistics(w, rng):
+    return "GET", "/api/statistics", None, None
+
+
+def filters(w, rng):
+    return "GET", "/api/filters", None, None
+
+
+def raw_medicines(w, rng):
+    return "GET", "/api/raw/medicines", None, None
+
+
+def create_medicine(w, rng):
+    generic, forms = rng.choice(GENERICS)
+    dosage_form, strength = rng.choice(forms)
+    body = {
+        "brand_name": f"Bench{rng.randint(1, 10 ** 6)}",
+        "type": "allopathic",
+        "dosage_form": dosage_form,
+        "generic": generic,
+        "strength": strength,
+        "manufacturer": "Benchmark Pharmaceuticals Ltd.",
+        "price": round(rng.uniform(5, 500), 2),
+    }
+    return "POST", "/api/medicines", None, body
+
+
+def update_price(w, rng):
+    medicine_id = rng.choice(w.created_ids) if w.created_ids else rng.randint(1, w.max_id)
+    return "PUT", f"/api/medicines/{medicine_id}", None, {"price": round(rng.uniform(5, 500), 2)}
+
+
+def delete_created(w, rng):
+    if not w.created_ids:
+        return update_price(w, rng)
+    return "DELETE", f"/api/medicines/{w.created_ids.pop()}", None, None
+
+
+# (name, weight, builder, is_write)
+SCENARIOS = [
+    ("list_medicines", 8, list_medicines, False),
+    ("search_brand_prefix", 20, search_brand_prefix, False),
+    ("search_brand_exact", 10, search_brand_exact, False),
+    ("search_generic", 10, search_generic, False),
+    ("search_filtered", 15, search_filtered, False),
+    ("search_price_range", 6, search_price_range, False),
+    ("search_deep_page", 4, search_deep_page, False),
+    ("get_medicine", 10, get_medicine, False),
+    ("statistics", 5, statistics, False),
+    ("filters", 5, filters, False),
+    ("raw_medicines", 1, raw_medicines, False),
+    ("create_medicine", 2, create_medicine, True),
+    ("update_price", 3, update_price, True),
+    ("delete_medicine", 1, delete_created, True),
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+async def run_load(base_url, duration, concurrency, seed, include_writes, warmup):
+    """Run the weighted scenario mix and return per-scenario latency summaries"""
+    scenarios = [s for s in SCENARIOS if include_writes or not s[3]]
+    weights = [s[1] for s in scenarios]
+    latencies = {name: [] for name, *_ in scenarios}
+    errors = {name: 0 for name, *_ in scenarios}
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        workload = await Workload.discover(client)
+        started = time.perf_counter()
+        record_from = started + warmup
+        deadline = record_from + duration
+
+        async def worker(worker_id):
+            rng = random.Random(seed * 1000 + worker_id)
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                name, _, builder, _ = rng.choices(scenarios, weights)[0]
+                method, path, params, body = builder(workload, rng)
+                request_started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, params=params, json=body)
+                    failed = response.status_code >= 500
+                    if name == "create_medicine" and response.status_code == 200:
+                        workload.created_ids.append(response.json()["id"])
+                except httpx.HTTPError:
+                    failed = True
+                elapsed_ms = (time.perf_counter() - request_started) * 1000
+                if request_started >= record_from:
+                    latencies[name].append(elapsed_ms)
+                    if failed:
+                        errors[name] += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "scenarios": {name: summarize(latencies[name], errors[name], duration) for name in latencies},
+        "overall": summarize(all_latencies, sum(errors.values()), duration),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_to_baseline(current, baseline, tolerance, min_delta_ms):
+    """Return a list of scenarios whose p95 regressed beyond tolerance"""
+    regressions = []
+    for name, stats in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not stats["count"] or not previous.get("count"):
+            continue
+        allowed = max(previous["p95_ms"] * (1 + tolerance), previous["p95_ms"] + min_delta_ms)
+        if stats["p95_ms"] > allowed:
+            regressions.append({
+                "scenario": name,
+                "baseline_p95_ms": previous["p95_ms"],
+                "current_p95_ms": stats["p95_ms"],
+                "allowed_p95_ms": round(allowed, 3),
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for the medicine catalog API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unrecorded warm-up seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--read-only", action="store_true", help="Skip create/update/delete scenarios")
+    parser.add_argument("--label", default="", help="Free-form label stored with the results")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Previous result file to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative p95 regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore p95 regressions smaller than this")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(
+        args.base_url, args.duration, args.concurrency, args.seed, not args.read_only, args.warmup
+    ))
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    results["meta"] = {
+        "timestamp": timestamp,
+        "label": args.label,
+        "git_revision": git_revision(),
+        "base_url": args.base_url,
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "read_only": args.read_only,
+    }
+
+    output = args.output or os.path.join("benchmarks", "results", f"{timestamp}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'scenario':<22}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in list(results["scenarios"].items()) + [("overall", results["overall"])]:
+        print(f"{name:<22}{stats['count']:>8}{stats['errors']:>8}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\np95 regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression['scenario']}: {regression['baseline_p95_ms']:.2f} ms -> "
+                      f"{regression['current_p95_ms']:.2f} ms (allowed {regression['allowed_p95_ms']:.2f} ms)")
+            sys.exit(1)
+        print("\nNo p95 regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Query Plan Regression Check
+Runs EXPLAIN QUERY PLAN for every supported search shape and fails when
+SQLite falls back to a full table scan or a temporary sort B-tree.
+
+Usage:
+    python -m benchmarks.query_plans                 # against a fresh 20k-row catalog
+    python -m benchmarks.query_plans --db medicines.db
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+from benchmarks.generate_catalog import write_catalog
+from indexes import ensure_indexes
+from schemas import MedicineSearch
+
+SORTS = ["brand_name", "price"]
+ORDERS = ["asc", "desc"]
+
+# Filter combinations the inventory UI and API clients issue
+FILTER_SHAPES = [
+    {},
+    {"type": "allopathic"},
+    {"dosage_form": "Tablet"},
+    {"type": "allopathic", "dosage_form": "Tablet"},
+]
+PRICE_SHAPES = [
+    {"min_price": 25, "max_price": 100, "sort_by": "price"},
+    {"min_price": 500, "sort_by": "price", "sort_order": "desc"},
+]
+# Unfiltered sorts by lookup name, served by the lookup table's name index
+EXTRA_SORTS = ["generic", "manufacturer", "type", "dosage_form"]
+
+
+def supported_shapes():
+    """Every (description, MedicineSearch) pair whose plan must stay index-only"""
+    shapes = []
+    for filters, sort_by, sort_order in itertools.product(FILTER_SHAPES, SORTS, ORDERS):
+        params = dict(filters, sort_by=sort_by, sort_order=sort_order)
+        shapes.append(params)
+    shapes.extend(PRICE_SHAPES)
+    shapes.extend({"sort_by": sort_by} for sort_by in EXTRA_SORTS)
+    return [(", ".join(f"{k}={v}" for k, v in params.items()), MedicineSearch(**params)) for params in shapes]
+
+
+def query_plan(db, query):
+    """EXPLAIN QUERY PLAN detail lines for an ORM query"""
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def plan_violations(plan):
+    """Full table scans and temporary sorts in a query plan"""
+    violations = []
+    for detail in plan:
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            violations.append(detail)
+        if "TEMP B-TREE" in detail:
+            violations.append(detail)
+    return violations
+
+
+def check_query_plans(db):
+    """Return {shape: [violations]} for every supported shape with a bad plan"""
+    failures = {}
+    for description, params in supported_shapes():
+        page_query = crud.build_search_query(db, params).offset(0).limit(params.per_page)
+        # Query.count() leaves out the eager lookup joins, so the plan is checked without them too
+        count_query = crud.filter_medicines(db, params).enable_eagerloads(False)
+        violations = plan_violations(query_plan(db, page_query))
+        if any(params.model_dump(include={"type", "dosage_form", "min_price", "max_price"}).values()):
+            # Unfiltered counts necessarily visit every row
+            violations += plan_violations(query_plan(db, count_query))
+        if violations:
+            failures[description] = violations
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert index-only query plans for supported searches")
+    parser.add_argument("--db", help="Existing SQLite catalog (default: generate a temporary one)")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows in the generated catalog")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "catalog.db")
+        if not args.db:
+            write_catalog(db_path, args.rows)
+        engine = create_engine(f"sqlite:///{db_path}")
+        ensure_indexes(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            failures = check_query_plans(db)
+            checked = len(supported_shapes())
+        finally:
+            db.close()
+            engine.dispose()
+
+    if failures:
+        for description, violations in failures.items():
+            print(f"FAIL [{description}]")
+            for violation in violations:
+                print(f"    {violation}")
+        print(f"\n{len(failures)} of {checked} query shapes use full scans or temp sorts")
+        sys.exit(1)
+    print(f"All {checked} query shapes use index-only plans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Startup Budget Check
+Imports the app in fresh interpreters and fails when import time, peak RSS
+or eagerly imported AI/search SDKs exceed the budget.
+
+Usage:
+    python -m benchmarks.startup_budget
+    python -m benchmarks.startup_budget --max-seconds 1.5 --max-rss-mb 120
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# SDKs that must only be imported on first use
+LAZY_MODULES = ["langchain_google_genai", "langchain_core", "google.genai", "tavily"]
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "eager_modules": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure(runs):
+    """Import `main` in `runs` fresh interpreters and collect the probe results"""
+    results = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", PROBE], text=True)
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check app import time and memory against a budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.5, help="Median import time budget")
+    parser.add_argument("--max-rss-mb", type=float, default=100.0, help="Median peak RSS budget")
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    seconds = statistics.median(r["seconds"] for r in results)
+    rss_mb = statistics.median(r["rss_mb"] for r in results)
+    eager_modules = sorted({m for r in results for m in r["eager_modules"]})
+
+    print(f"import main: {seconds:.3f}s (budget {args.max_seconds}s), "
+          f"peak RSS {rss_mb:.1f} MB (budget {args.max_rss_mb} MB)")
+
+    failures = []
+    if seconds > args.max_seconds:
+        failures.append(f"import time {seconds:.3f}s exceeds {args.max_seconds}s")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {rss_mb:.1f} MB exceeds {args.max_rss_mb} MB")
+    if eager_modules:
+        failures.append(f"imported at startup instead of on first use: {', '.join(eager_modules)}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Write Contention Benchmark
+Runs concurrent single-item price updates against a fresh catalog, first
+with one commit per update (the old crud path), then through the write
+coordinator, and reports throughput, latency and lock errors for both.
+Before benchmarking it checks that one coordinator batch really is one
+SQLite transaction and that a batch which can't get the write lock fails
+its callers instead of leaving them waiting (exits non-zero if not).
+
+Usage:
+    python -m benchmarks.write_contention
+    python -m benchmarks.write_contention --check-only
+    python -m benchmarks.write_contention --threads 64 --ops 100 --synchronous FULL
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import crud
+from benchmarks.generate_catalog import write_catalog
+from database import configure_sqlite_engine, BEGIN_IMMEDIATE
+from schemas import MedicineUpdate
+from write_coordinator import WriteCoordinator
+
+
+def make_session_factory(db_path, synchronous):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine)
+
+    @event.listens_for(engine, "connect")
+    def set_synchronous(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"PRAGMA synchronous={synchronous}")
+
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def check_group_commit(engine, session_factory):
+    """Commit one batch of updates plus a failing operation; returns a list of problems"""
+    commits = []
+    released_outside_transaction = []
+
+    def count_commit(connection):
+        commits.append(connection)
+
+    def check_release(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("RELEASE SAVEPOINT") and not connection.connection.dbapi_connection.in_transaction:
+            released_outside_transaction.append(statement)
+
+    def fail(db):
+        raise ValueError("rejected")
+
+    prices = {medicine_id: 100.0 + medicine_id for medicine_id in (1, 2, 3)}
+    coordinator = WriteCoordinator(session_factory, window=0.5, max_ops=len(prices) + 1)
+    coordinator.start()
+    event.listen(engine, "commit", count_commit)
+    event.listen(engine, "after_cursor_execute", check_release)
+    try:
+        futures = [
+            coordinator.submit(crud.apply_update_medicine, medicine_id, MedicineUpdate(price=price))
+            for medicine_id, price in prices.items()
+        ]
+        failing = coordinator.submit(fail)
+        for future in futures:
+            future.result()
+        failed = failing.exception() is not None
+    finally:
+        event.remove(engine, "after_cursor_execute", check_release)
+        event.remove(engine, "commit", count_commit)
+        coordinator.stop()
+
+    problems = []
+    if len(commits) != 1:
+        problems.append(f"expected 1 commit for the batch, saw {len(commits)}")
+    if released_outside_transaction:
+        problems.append(f"{len(released_outside_transaction)} SAVEPOINT releases committed on their own")
+    if not failed:
+        problems.append("failing operation was not reported to its caller")
+    db = session_factory()
+    try:
+        stored = {medicine_id: crud.get_medicine(db, medicine_id).price for medicine_id in prices}
+    finally:
+        db.close()
+    if stored != prices:
+        problems.append(f"batch results not persisted: {stored}")
+    return problems
+
+
+def check_lock_timeout(db_path, synchronous):
+    """Hold the write lock past busy_timeout; the batch's callers must get the error"""
+    engine, session_factory = make_session_factory(db_path, synchronous)
+
+    @event.listens_for(engine, "connect")
+    def short_busy_timeout(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA busy_timeout=200")
+
+    coordinator = WriteCoordinator(session_factory)
+    coordinator.start()
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    problems = []
+    try:
+        blocker.execute("BEGIN IMMEDIATE")
+        blocked = coordinator.submit(crud.apply_update_medicine, 1, MedicineUpdate(price=1.0))
+        try:
+            error = blocked.exception(timeout=5)
+        except FutureTimeoutError:
+            problems.append("write blocked past busy_timeout never resolved")
+        else:
+            if not isinstance(error, OperationalError):
+                problems.append(f"write blocked past busy_timeout returned {error!r}")
+        blocker.execute("ROLLBACK")
+
+        after = coordinator.submit(crud.apply_update_medicine, 1, MedicineUpdate(price=2.0))
+        try:
+            after.result(timeout=5)
+        except Exception as e:
+            problems.append(f"write after the lock was released failed: {e!r}")
+    finally:
+        blocker.close()
+        coordinator.stop()
+        engine.dispose()
+    return problems
+
+
+def run_threads(threads, ops, rows, write_one):
+    """Run `threads` workers doing `ops` updates each; returns (elapsed, latencies, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        local = []
+        barrier.wait()
+        for _ in range(ops):
+            update = MedicineUpdate(price=round(rng.uniform(1, 500), 2))
+            started = time.perf_counter()
+            try:
+                write_one(rng.randint(1, rows), update)
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, latencies, errors[0]
+
+
+def report(name, elapsed, latencies, errors):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(
+        f"{name:<12} {len(latencies) / elapsed:>9.0f} writes/s   "
+        f"p50 {statistics.median(latencies) * 1000 if latencies else 0:>7.2f} ms   "
+        f"p95 {p95 * 1000:>7.2f} ms   lock errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request commits with coalesced writes")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows in the generated catalog")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent writers")
+    parser.add_argument("--ops", type=int, default=50, help="Updates per writer")
+    parser.add_argument("--synchronous", default="FULL", choices=["OFF", "NORMAL", "FULL"],
+                        help="SQLite synchronous mode (FULL fsyncs every commit)")
+    parser.add_argument("--check-only", action="store_true", help="Only run the group commit check")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "catalog.db")
+        write_catalog(db_path, args.rows)
+        engine, session_factory = make_session_factory(db_path, args.synchronous)
+
+        problems = check_group_commit(engine, session_factory)
+        problems += check_lock_timeout(db_path, args.synchronous)
+        if problems:
+            for problem in problems:
+                print(f"FAIL group commit: {problem}")
+            engine.dispose()
+            sys.exit(1)
+        print("Group commit: one batch, one transaction; lock timeouts reach every caller")
+        if args.check_only:
+            engine.dispose()
+            return
+
+        def direct(medicine_id, update):
+            db = session_factory()
+            try:
+                db.connection(execution_options=BEGIN_IMMEDIATE)
+                crud.update_medicine(db, medicine_id, update)
+            finally:
+                db.close()
+
+        print(f"{args.threads} writers x {args.ops} updates, synchronous={args.synchronous}\n")
+        report("per-request", *run_threads(args.threads, args.ops, args.rows, direct))
+
+        coordinator = WriteCoordinator(session_factory)
+        coordinator.start()
+        try:
+            coalesced = lambda medicine_id, update: coordinator.submit(
+                crud.apply_update_medicine, medicine_id, update).result()
+            report("coalesced", *run_threads(args.threads, args.ops, args.rows, coalesced))
+        finally:
+            coordinator.stop()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
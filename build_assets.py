@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Medicine Inventory System - Static Asset Build
+Copies every file under static/ into static/dist/ with a content hash in its
+name, writes gzip and brotli variants next to it and records the mapping
+in static/dist/manifest.json.
+
+Templates reference assets through asset_url("js/main.js"), which resolves
+to the fingerprinted file once this has been run.
+
+Usage:
+    python build_assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+import brotli
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+COMPRESSIBLE_EXTENSIONS = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+# Compressed variants are only kept when at most this fraction of the original size
+MIN_SAVING = 0.9
+
+
+def fingerprint(path):
+    """First 12 hex digits of the file's SHA-256"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def source_files(static_dir=STATIC_DIR):
+    """Asset paths relative to static_dir, skipping the build output"""
+    dist_dir = os.path.join(static_dir, "dist")
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist_dir]
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/")
+
+
+def write_compressed(path, data):
+    """Write .gz / .br variants of `data` next to `path` when they actually save bytes"""
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    variants.append((".br", brotli.compress(data, quality=11)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data) * MIN_SAVING:
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+            written.append(suffix)
+    return written
+
+
+def build(static_dir=STATIC_DIR):
+    """Rebuild static/dist from scratch and return the manifest"""
+    dist_dir = os.path.join(static_dir, "dist")
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    for relative_path in source_files(static_dir):
+        source = os.path.join(static_dir, relative_path)
+        stem, extension = os.path.splitext(relative_path)
+        hashed_path = f"{stem}.{fingerprint(source)}{extension}"
+        target = os.path.join(dist_dir, hashed_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target)
+
+        encodings = []
+        if extension in COMPRESSIBLE_EXTENSIONS:
+            with open(source, "rb") as f:
+                encodings = write_compressed(target, f.read())
+        manifest[relative_path] = hashed_path
+        print(f"{relative_path} -> dist/{hashed_path} {' '.join(encodings)}".rstrip())
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    print("Medicine Inventory System - Static Asset Build")
+    print("=" * 50)
+    manifest = build()
+    print(f"\nBuilt {len(manifest)} assets into {DIST_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,38 @@ load_dotenv()
 
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "YOUR_GOOGLE_API_KEY")
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "YOUR_TAVILY_API_KEY")
\ No newline at end of file
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "YOUR_TAVILY_API_KEY")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./medicines.db")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MIN_INTERVAL = float(os.getenv("PROFILE_MIN_INTERVAL", "10"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+SESSION_TTL = float(os.getenv("SESSION_TTL", "86400"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "21600"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+ANSWER_CACHE_MATCH_THRESHOLD = float(os.getenv("ANSWER_CACHE_MATCH_THRESHOLD", "92"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", "33554432"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "0"))
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "5"))
+WRITE_BATCH_MAX_OPS = int(os.getenv("WRITE_BATCH_MAX_OPS", "64"))
+STATIC_PAGE_CACHE = os.getenv("STATIC_PAGE_CACHE", "true").lower() in ("1", "true", "yes")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+GEMINI_RATE_PER_SECOND = float(os.getenv("GEMINI_RATE_PER_SECOND", "5"))
+GEMINI_BURST = float(os.getenv("GEMINI_BURST", "10"))
+GEMINI_SLOW_CALL_SECONDS = float(os.getenv("GEMINI_SLOW_CALL_SECONDS", "20"))
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "8"))
+TAVILY_RATE_PER_SECOND = float(os.getenv("TAVILY_RATE_PER_SECOND", "5"))
+TAVILY_BURST = float(os.getenv("TAVILY_BURST", "10"))
+TAVILY_SLOW_CALL_SECONDS = float(os.getenv("TAVILY_SLOW_CALL_SECONDS", "5"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+EXTRACT_REQUEST_BUDGET = float(os.getenv("EXTRACT_REQUEST_BUDGET", "45"))
+CHAT_REQUEST_BUDGET = float(os.getenv("CHAT_REQUEST_BUDGET", "25"))
+FAULT_STUBS = os.getenv("FAULT_STUBS", "false").lower() in ("1", "true", "yes")
+FAULT_STUB_LATENCY = float(os.getenv("FAULT_STUB_LATENCY", "0"))
+FAULT_STUB_ERROR_RATE = float(os.getenv("FAULT_STUB_ERROR_RATE", "0"))
@@ -1,8 +1,9 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import or_, and_, func, case, exists, false, select
 from typing import List, Optional
-from models import Medicine
-from schemas import MedicineCreate, MedicineUpdate, MedicineSearch
+from models import Medicine, Generic, LOOKUP_FIELDS
+from schemas import MedicineCreate, MedicineUpdate, MedicineSearch, MedicineResponse
+from search_cache import search_cache, canonical_search_key
 
 def get_medicine(db: Session, medicine_id: int):
     """Get medicine by ID"""
@@ -10,45 +11,147 @@ def get_medicine(db: Session, medicine_id: int):
 
 def get_medicines(db: Session, skip: int = 0, limit: int = 100):
     """Get all medicines with pagination"""
-    return db.query(Medicine).offset(skip).limit(limit).all()
+    # Explicit order: with the lookup joins SQLite no longer returns rows in id order by itself
+    return db.query(Medicine).order_by(Medicine.id).offset(skip).limit(limit).all()
+
+class LookupCache:
+    """Get-or-create lookup rows by name, remembered for the lifetime of the cache"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._entries = {}
+
+    def get(self, field: str, name: Optional[str]):
+        key = (field, name)
+        entry = self._entries.get(key)
+        if entry is None:
+            model = LOOKUP_FIELDS[field]
+            condition = model.name.is_(None) if name is None else model.name == name
+            entry = self.db.query(model).filter(condition).first()
+            if entry is None:
+                entry = model(name=name)
+                self.db.add(entry)
+            self._entries[key] = entry
+        return entry
+
+def set_medicine_fields(db_medicine: Medicine, data: dict, lookups: LookupCache):
+    """Assign plain columns directly and lookup-backed fields via their lookup rows"""
+    for field, value in data.items():
+        if field in LOOKUP_FIELDS:
+            setattr(db_medicine, f"{field}_ref", lookups.get(field, value))
+        else:
+            setattr(db_medicine, field, value)
+
+def build_medicine(data: dict, lookups: LookupCache):
+    """New Medicine from API-shaped data (missing lookup fields become NULL names)"""
+    db_medicine = Medicine()
+    set_medicine_fields(db_medicine, {**{field: None for field in LOOKUP_FIELDS}, **data}, lookups)
+    return db_medicine
+
+def apply_create_medicine(db: Session, medicine: MedicineCreate):
+    """Stage a new medicine and return it as a dict (flushes, doesn't commit)"""
+    db_medicine = build_medicine(medicine.dict(exclude_unset=True), LookupCache(db))
+    db.add(db_medicine)
+    db.flush()
+    return db_medicine.to_dict()
+
+def apply_update_medicine(db: Session, medicine_id: int, medicine: MedicineUpdate):
+    """Stage an update and return the updated medicine as a dict, or None if missing"""
+    db_medicine = db.get(Medicine, medicine_id)
+    if db_medicine is None:
+        return None
+    set_medicine_fields(db_medicine, medicine.dict(exclude_unset=True), LookupCache(db))
+    db.flush()
+    return db_medicine.to_dict()
+
+def apply_delete_medicine(db: Session, medicine_id: int):
+    """Stage a delete; returns False if the medicine doesn't exist"""
+    deleted = db.query(Medicine).filter(Medicine.id == medicine_id).delete(synchronize_session=False)
+    return deleted > 0
 
 def create_medicine(db: Session, medicine: MedicineCreate):
     """Create new medicine"""
-    db_medicine = Medicine(**medicine.dict(exclude_unset=True))
-    db.add(db_medicine)
+    result = apply_create_medicine(db, medicine)
     db.commit()
-    db.refresh(db_medicine)
-    return db_medicine
+    search_cache.invalidate()
+    return result
 
 def update_medicine(db: Session, medicine_id: int, medicine: MedicineUpdate):
     """Update medicine"""
-    db_medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
-    if db_medicine:
-        update_data = medicine.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_medicine, field, value)
+    result = apply_update_medicine(db, medicine_id, medicine)
+    if result is not None:
         db.commit()
-        db.refresh(db_medicine)
-    return db_medicine
+        search_cache.invalidate()
+    return result
 
 def delete_medicine(db: Session, medicine_id: int):
     """Delete medicine"""
-    db_medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
-    if db_medicine:
-        db.delete(db_medicine)
+    deleted = apply_delete_medicine(db, medicine_id)
+    if deleted:
         db.commit()
-    return db_medicine
+        search_cache.invalidate()
+    return deleted
 
-def search_medicines(db: Session, search_params: MedicineSearch):
-    """Advanced search functionality"""
+# Facets the search endpoint can count (grouped by lookup key), and the price histogram bucket edges
+FACET_COLUMNS = {
+    "type": Medicine.type_id,
+    "dosage_form": Medicine.dosage_form_id,
+    "manufacturer": Medicine.manufacturer_id,
+}
+PRICE_FACET = "price"
+PRICE_BUCKET_EDGES = [0, 10, 25, 50, 100, 250, 500, 1000]
+# Search filters each facet ignores when counting, so the other values of a
+# facet that is already filtered on still show how many results they'd give
+FACET_FILTERS = {
+    "type": ("type",),
+    "dosage_form": ("dosage_form",),
+    "manufacturer": (),
+    PRICE_FACET: ("min_price", "max_price"),
+}
+
+def _search_match_clauses(search_params: MedicineSearch):
+    """Exact and partial match clauses for the general search query"""
+    if search_params.search_type == "brand_name":
+        column = Medicine.brand_name
+        return column.ilike(search_params.query), column.ilike(f"%{search_params.query}%")
+    if search_params.search_type == "generic_name":
+        # Match against the (small) generics table, then probe medicines by key
+        def matching_generics(pattern):
+            return Medicine.generic_id.in_(select(Generic.id).where(Generic.name.ilike(pattern)))
+        return matching_generics(search_params.query), matching_generics(f"%{search_params.query}%")
+    return None, None
+
+def _lookup_filter(db: Session, field: str, value: str):
+    """
+    Filter on a lookup-backed field by case-insensitive name. The names are
+    resolved to keys up front so the composite (key, sort column) indexes
+    serve both the filter and the ORDER BY.
+    """
+    model = LOOKUP_FIELDS[field]
+    column = getattr(Medicine, f"{field}_id")
+    # Resolved once per (read) session; the page and count queries share it
+    resolved = db.info.setdefault("lookup_ids", {})
+    ids = resolved.get((field, value))
+    if ids is None:
+        ids = resolved[(field, value)] = [
+            row[0] for row in db.query(model.id).filter(model.name.collate("NOCASE") == value)
+        ]
+    if not ids:
+        return false()
+    if len(ids) == 1:
+        return column == ids[0]
+    return column.in_(ids)
+
+def filter_medicines(db: Session, search_params: MedicineSearch):
+    """Query with every search filter applied, without ordering or pagination"""
     base_query = db.query(Medicine)
     
-    # Apply specific field filters first
+    # Apply specific field filters first (case-insensitive on the lookup names)
     if search_params.type:
-        base_query = base_query.filter(Medicine.type.ilike(f"%{search_params.type}%"))
+        base_query = base_query.filter(_lookup_filter(db, "type", search_params.type))
     
     if search_params.dosage_form:
-        base_query = base_query.filter(Medicine.dosage_form.ilike(f"%{search_params.dosage_form}%"))
+        base_query = base_query.filter(_lookup_filter(db, "dosage_form", search_params.dosage_form))
     
     # Price range filters
     if search_params.min_price is not None:
@@ -57,43 +160,125 @@ def search_medicines(db: Session, search_params: MedicineSearch):
     if search_params.max_price is not None:
         base_query = base_query.filter(Medicine.price <= search_params.max_price)
 
-    # Handle general search query with exact match priority
+    # General search query
     if search_params.query:
-        exact_match_clause = None
-        partial_match_clause = None
-
-        if search_params.search_type == "brand_name":
-            exact_match_clause = (Medicine.brand_name.ilike(search_params.query))
-            partial_match_clause = (Medicine.brand_name.ilike(f"%{search_params.query}%"))
-        elif search_params.search_type == "generic_name":
-            exact_match_clause = (Medicine.generic.ilike(search_params.query))
-            partial_match_clause = (Medicine.generic.ilike(f"%{search_params.query}%"))
-        
-        if exact_match_clause is not None and partial_match_clause is not None:
-            # Order by exact match first, then partial match
+        exact_match_clause, partial_match_clause = _search_match_clauses(search_params)
+        if exact_match_clause is not None:
             base_query = base_query.filter(or_(exact_match_clause, partial_match_clause))
+
+    return base_query
+
+def build_search_query(db: Session, search_params: MedicineSearch):
+    """Filtered and ordered search query, before pagination"""
+    base_query = filter_medicines(db, search_params)
+
+    # Order by exact match first, then partial match
+    if search_params.query:
+        exact_match_clause, _ = _search_match_clauses(search_params)
+        if exact_match_clause is not None:
             base_query = base_query.order_by(exact_match_clause.desc())
 
-    # Sorting
-    sort_column = getattr(Medicine, search_params.sort_by, Medicine.brand_name)
+    # Sorting (lookup-backed fields sort by name through their lookup table)
+    if search_params.sort_by in LOOKUP_FIELDS:
+        relationship = getattr(Medicine, f"{search_params.sort_by}_ref")
+        base_query = base_query.join(relationship).options(contains_eager(relationship))
+        sort_column = LOOKUP_FIELDS[search_params.sort_by].name
+    else:
+        sort_column = getattr(Medicine, search_params.sort_by, Medicine.brand_name)
     if search_params.sort_order == "desc":
         base_query = base_query.order_by(sort_column.desc())
     else:
         base_query = base_query.order_by(sort_column.asc())
+
+    return base_query
+
+def search_medicines(db: Session, search_params: MedicineSearch):
+    """Advanced search functionality"""
+    base_query = build_search_query(db, search_params)
     
-    # Pagination
-    total = base_query.count()
+    # Pagination (the count skips the ordering it doesn't need)
+    total = filter_medicines(db, search_params).count()
     offset = (search_params.page - 1) * search_params.per_page
     medicines = base_query.offset(offset).limit(search_params.per_page).all()
     
     return medicines, total
 
+def search_medicines_cached(db: Session, search_params: MedicineSearch, facets: List[str] = ()):
+    """
+    search_medicines (plus facet counts when requested) through the result
+    cache. Returns plain dicts so a hit never touches the session.
+    """
+    def compute():
+        medicines, total = search_medicines(db, search_params)
+        return {
+            "medicines": [MedicineResponse.model_validate(m).model_dump() for m in medicines],
+            "total": total,
+            "facets": get_search_facets(db, search_params, facets) if facets else None,
+        }
+
+    return search_cache.get_or_compute("search", canonical_search_key(search_params, facets), compute)
+
+def get_search_facets(db: Session, search_params: MedicineSearch, facets: List[str]):
+    """
+    Per-value counts for the requested facets over the filtered result set,
+    each counted with its own filter removed (see FACET_FILTERS).
+
+    Each facet is its own GROUP BY on an integer lookup key (or price
+    bucket), which the composite indexes usually cover; a combined GROUP BY
+    would have to visit every table row. Keys are then mapped to names.
+    """
+    base_queries = {}
+    result = {}
+    for facet in facets:
+        ignored = FACET_FILTERS.get(facet, ())
+        base_query = base_queries.get(ignored)
+        if base_query is None:
+            facet_params = search_params.model_copy(update={field: None for field in ignored})
+            base_query = base_queries[ignored] = filter_medicines(db, facet_params)
+        if facet in FACET_COLUMNS:
+            column = FACET_COLUMNS[facet]
+            key_counts = dict(base_query.with_entities(column, func.count()).group_by(column).all())
+            model = LOOKUP_FIELDS[facet]
+            names = dict(db.query(model.id, model.name).filter(model.id.in_(list(key_counts))).all()) if key_counts else {}
+            counts = {}
+            for key, count in key_counts.items():
+                name = names.get(key)
+                if name is not None:
+                    counts[name] = counts.get(name, 0) + count
+            result[facet] = [
+                {"value": value, "count": count}
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            ]
+        elif facet == PRICE_FACET:
+            # Bucket index i covers [edges[i], edges[i + 1]); the last bucket is open-ended
+            bucket_index = case(
+                *[(Medicine.price < edge, index - 1) for index, edge in enumerate(PRICE_BUCKET_EDGES) if index],
+                else_=len(PRICE_BUCKET_EDGES) - 1,
+            )
+            bucket = case((Medicine.price.is_(None), None), else_=bucket_index)
+            counts = dict(base_query.with_entities(bucket, func.count()).group_by(bucket).all())
+            result[facet] = [
+                {
+                    "min": edge,
+                    "max": PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None,
+                    "count": counts.get(index, 0),
+                }
+                for index, edge in enumerate(PRICE_BUCKET_EDGES)
+            ]
+    return result
+
+def _used_lookup_names(db: Session, field: str):
+    """Non-null names in a lookup table that at least one medicine still refers to"""
+    model = LOOKUP_FIELDS[field]
+    column = getattr(Medicine, f"{field}_id")
+    return db.query(model.name).filter(model.name.isnot(None), exists().where(column == model.id))
+
 def get_medicine_statistics(db: Session):
     """Get medicine inventory statistics"""
     total_medicines = db.query(Medicine).count()
-    total_manufacturers = db.query(Medicine.manufacturer).distinct().count()
-    total_types = db.query(Medicine.type).distinct().count()
-    total_dosage_forms = db.query(Medicine.dosage_form).distinct().count()
+    total_manufacturers = _used_lookup_names(db, "manufacturer").count()
+    total_types = _used_lookup_names(db, "type").count()
+    total_dosage_forms = _used_lookup_names(db, "dosage_form").count()
     
     # Price statistics
     price_stats = db.query(
@@ -116,10 +301,14 @@ def get_medicine_statistics(db: Session):
 
 def get_filter_options(db: Session):
     """Get filter options for search interface"""
-    types = [t[0] for t in db.query(Medicine.type).distinct().all() if t[0]]
-    dosage_forms = [d[0] for d in db.query(Medicine.dosage_form).distinct().all() if d[0]]
+    types = [t[0] for t in _used_lookup_names(db, "type").all() if t[0]]
+    dosage_forms = [d[0] for d in _used_lookup_names(db, "dosage_form").all() if d[0]]
     
     return {
         "types": sorted(types),
         "dosage_forms": sorted(dosage_forms)
-    }
\ No newline at end of file
+    }
+
+def get_filter_options_cached(db: Session):
+    """get_filter_options through the result cache"""
+    return search_cache.get_or_compute("filter_options", (), lambda: get_filter_options(db))
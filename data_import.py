@@ -4,11 +4,15 @@ Medicine Inventory System - Data Import Script
 This script helps import data from the existing medicines.db database
 """
 
+import os
 import sqlite3
 import pandas as pd
 from sqlalchemy import create_engine
-from models import Medicine, Base
-from database import engine, SessionLocal
+from models import Medicine, LOOKUP_FIELDS
+from database import engine, SessionLocal, init_db, DATABASE_PATH
+from indexes import drop_indexes, ensure_indexes, analyze
+from search_cache import search_cache
+from crud import LookupCache, build_medicine
 import re
 
 def extract_price(package_info):
@@ -39,38 +43,78 @@ def clean_medicine_data(row):
         'price': extract_price(row.get('package_container', ''))
     }
 
-def import_from_existing_db():
-    """Import data from existing medicines.db"""
+# Tables this app creates itself; skipped when importing from the app's own database
+APP_TABLES = {Medicine.__tablename__} | {model.__tablename__ for model in LOOKUP_FIELDS.values()}
+REQUIRED_SOURCE_COLUMNS = {'brand_name'}
+
+def is_app_database(path):
+    try:
+        return os.path.samefile(path, DATABASE_PATH)
+    except OSError:
+        return False
+
+def find_source_table(cursor, skip_tables=()):
+    """First table not in skip_tables that has the required columns"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
+    tables = [row[0] for row in cursor.fetchall()]
+    print(f"Found tables: {tables}")
+    for table_name in tables:
+        if table_name in skip_tables:
+            continue
+        if REQUIRED_SOURCE_COLUMNS <= set(table_columns(cursor, table_name)):
+            return table_name
+    return None
+
+def table_columns(cursor, table_name):
+    cursor.execute(f'PRAGMA table_info("{table_name}")')
+    return [col[1] for col in cursor.fetchall()]
+
+def import_from_existing_db(source_path='medicines.db', table_name=None):
+    """
+    Import data from an existing SQLite database, replacing the catalog.
+    Reads `table_name`, or the first table with a brand_name column. The
+    app's own tables are never a source, and the current catalog is only
+    cleared once the source has been read and checked.
+    """
     try:
         # Connect to existing database
-        conn = sqlite3.connect('medicines.db')
+        conn = sqlite3.connect(source_path)
         cursor = conn.cursor()
         
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        print(f"Found tables: {tables}")
-        
-        # Try to get data from the first table
-        if tables:
-            table_name = tables[0][0]
-            print(f"Reading from table: {table_name}")
-            
-            # Get all data
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
-            # Get column names
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            print(f"Found {len(rows)} rows with columns: {columns}")
-            
-            # Create new session
-            db = SessionLocal()
-            
-            # Clear existing data
+        skip_tables = APP_TABLES if is_app_database(source_path) else ()
+        if table_name is None:
+            table_name = find_source_table(cursor, skip_tables)
+        if table_name is None:
+            print("No importable table found in the database")
+            return 0
+        if table_name in skip_tables:
+            print(f"Refusing to import {table_name}: it is one of this app's own tables")
+            return 0
+
+        print(f"Reading from table: {table_name}")
+        columns = table_columns(cursor, table_name)
+        missing = REQUIRED_SOURCE_COLUMNS - set(columns)
+        if missing:
+            print(f"Refusing to import {table_name}: missing columns {sorted(missing)}")
+            return 0
+
+        # Get all data
+        cursor.execute(f'SELECT * FROM "{table_name}"')
+        rows = cursor.fetchall()
+        print(f"Found {len(rows)} rows with columns: {columns}")
+        if not rows:
+            print(f"Refusing to import {table_name}: no rows")
+            return 0
+
+        # Drop secondary indexes so the bulk load doesn't maintain them row by row
+        drop_indexes(engine)
+
+        # Create new session
+        db = SessionLocal()
+        try:
+            # Clear existing data (committed together with the import)
             db.query(Medicine).delete()
+            lookups = LookupCache(db)
             
             # Import data
             imported_count = 0
@@ -82,7 +126,7 @@ def import_from_existing_db():
                 medicine_data = clean_medicine_data(row_dict)
                 
                 # Create medicine object
-                medicine = Medicine(**medicine_data)
+                medicine = build_medicine(medicine_data, lookups)
                 db.add(medicine)
                 imported_count += 1
                 
@@ -90,14 +134,19 @@ def import_from_existing_db():
                     print(f"Imported {imported_count} medicines...")
             
             db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
             db.close()
-            
-            print(f"Successfully imported {imported_count} medicines")
-            return imported_count
-            
-        else:
-            print("No tables found in the database")
-            return 0
+            # Rebuild indexes and refresh planner statistics
+            ensure_indexes(engine)
+
+        # Other processes notice the file change; this one is told directly
+        search_cache.invalidate("import")
+        
+        print(f"Successfully imported {imported_count} medicines")
+        return imported_count
             
     except Exception as e:
         print(f"Error importing data: {e}")
@@ -183,12 +232,15 @@ def create_sample_data():
     db.query(Medicine).delete()
     
     # Add sample data
+    lookups = LookupCache(db)
     for medicine_data in sample_medicines:
-        medicine = Medicine(**medicine_data)
+        medicine = build_medicine(medicine_data, lookups)
         db.add(medicine)
     
     db.commit()
     db.close()
+    analyze(engine)
+    search_cache.invalidate("import")
     
     print(f"Created {len(sample_medicines)} sample medicines")
     return len(sample_medicines)
@@ -198,17 +250,26 @@ def main():
     print("Medicine Inventory System - Data Import")
     print("=" * 50)
     
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    # Create tables and indexes if they don't exist
+    init_db()
     print("Database tables created/verified")
     
     # Try to import from existing database
     imported_count = import_from_existing_db()
     
-    # If no data was imported, create sample data
+    # If nothing was imported into an empty catalog, create sample data
     if imported_count == 0:
-        print("No existing data found, creating sample data...")
-        imported_count = create_sample_data()
+        db = SessionLocal()
+        try:
+            existing_count = db.query(Medicine).count()
+        finally:
+            db.close()
+        if existing_count:
+            print(f"Keeping the existing {existing_count} medicines")
+            imported_count = existing_count
+        else:
+            print("No existing data found, creating sample data...")
+            imported_count = create_sample_data()
     
     print(f"\nImport completed. Total medicines: {imported_count}")
     print("\nYou can now start the FastAPI server with:")
@@ -1,17 +1,52 @@
-from sqlalchemy import create_engine, MetaData, Table
+from sqlalchemy import create_engine, event, MetaData, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import sqlite3
 import os
 
+from config.load_env import DATABASE_URL
+from metrics import instrument_engine
+
 # Database configuration
-SQLALCHEMY_DATABASE_URL = "sqlite:///./medicines.db"
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+DATABASE_PATH = SQLALCHEMY_DATABASE_URL.replace("sqlite:///", "", 1)
 
 # Create engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
     connect_args={"check_same_thread": False}
 )
+instrument_engine(engine)
+
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    """WAL lets readers proceed during the write coordinator's batch commits"""
+    # pysqlite only sends BEGIN before DML, so a leading SAVEPOINT would start
+    # (and its RELEASE commit) a transaction of its own; begin_sqlite_transaction
+    # takes over instead
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+# Execution options for connections that are about to write: take the write
+# lock up front (waiting out busy_timeout) rather than failing to upgrade a
+# read transaction when another writer got there first
+BEGIN_IMMEDIATE = {"sqlite_begin": "IMMEDIATE"}
+
+def begin_sqlite_transaction(connection):
+    """Emit BEGIN ourselves so SAVEPOINTs nest inside one transaction"""
+    options = connection.get_execution_options()
+    if options.get("isolation_level") != "AUTOCOMMIT":
+        connection.exec_driver_sql(f"BEGIN {options.get('sqlite_begin', 'DEFERRED')}")
+
+def configure_sqlite_engine(engine):
+    """Connection pragmas plus explicit transaction control for a SQLite engine"""
+    event.listen(engine, "connect", configure_sqlite_connection)
+    event.listen(engine, "begin", begin_sqlite_transaction)
+
+configure_sqlite_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -30,9 +65,18 @@ def get_db():
     finally:
         db.close()
 
+def init_db():
+    """Migrate legacy schemas, create tables for all models (if needed) and bring indexes up to date"""
+    import models  # noqa: F401 - registers the models on Base.metadata
+    from indexes import ensure_indexes
+    from migrations import migrate_to_lookup_tables
+    migrate_to_lookup_tables(engine)
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+
 def check_database_exists():
-    """Check if medicines.db exists"""
-    return os.path.exists("medicines.db")
+    """Check if the configured database file exists"""
+    return os.path.exists(DATABASE_PATH)
 
 def get_medicine_table():
     """Get the existing medicine table using reflection"""
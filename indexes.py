@@ -0,0 +1,68 @@
+"""
+Index management for the medicines table.
+
+The indexes below are matched to the search patterns the API serves:
+optional type / dosage form filters (by lookup key) combined with sorting
+by brand name or price, plus single-column indexes for the unfiltered sorts
+and the key lookups used when sorting or grouping by a lookup table's name.
+Anything else on the table named ix_medicines_* (e.g. the old per-column
+or string-keyed indexes) is dropped as redundant.
+"""
+
+from sqlalchemy import text
+
+TABLE = "medicines"
+
+# name -> indexed column list
+INDEXES = {
+    "ix_medicines_brand_name": "brand_name",
+    "ix_medicines_price": "price",
+    "ix_medicines_generic_id": "generic_id",
+    "ix_medicines_manufacturer_id": "manufacturer_id",
+    "ix_medicines_type_id_brand_name": "type_id, brand_name",
+    "ix_medicines_type_id_price": "type_id, price",
+    "ix_medicines_dosage_form_id_brand_name": "dosage_form_id, brand_name",
+    "ix_medicines_dosage_form_id_price": "dosage_form_id, price",
+    "ix_medicines_type_id_dosage_form_id_brand_name": "type_id, dosage_form_id, brand_name",
+    "ix_medicines_type_id_dosage_form_id_price": "type_id, dosage_form_id, price",
+}
+
+
+def existing_indexes(connection):
+    """Names of the explicit indexes currently on the medicines table"""
+    rows = connection.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table AND sql IS NOT NULL"),
+        {"table": TABLE},
+    )
+    return {row[0] for row in rows}
+
+
+def ensure_indexes(engine):
+    """Create missing indexes, drop redundant ones and refresh planner statistics"""
+    with engine.begin() as connection:
+        current = existing_indexes(connection)
+        redundant = {name for name in current if name.startswith(f"ix_{TABLE}_")} - set(INDEXES)
+        missing = set(INDEXES) - current
+
+        for name in sorted(redundant):
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for name in sorted(missing):
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {TABLE} ({INDEXES[name]})"))
+
+    if redundant or missing:
+        print(f"Indexes updated: {len(missing)} created, {len(redundant)} dropped")
+        analyze(engine)
+
+
+def drop_indexes(engine):
+    """Drop every managed index, e.g. before a bulk load"""
+    with engine.begin() as connection:
+        for name in existing_indexes(connection):
+            if name.startswith(f"ix_{TABLE}_"):
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def analyze(engine):
+    """Refresh SQLite's planner statistics after bulk changes"""
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
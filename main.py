@@ -1,12 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Query, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import uvicorn
 
-from database import get_db, check_database_exists, get_medicine_table, execute_raw_query
+from config.load_env import WARMUP_ON_STARTUP, FAULT_STUBS, STATIC_PAGE_CACHE
+from database import get_db, init_db, check_database_exists, get_medicine_table, execute_raw_query, engine
 from models import Medicine
 from schemas import (
     MedicineCreate, 
@@ -18,49 +20,91 @@ from schemas import (
 )
 from routers.prescription_route import prescription_router
 from routers.chatbot_route import chatbot_router
+from routers.admin_route import admin_router
+from metrics import MetricsMiddleware, render_metrics
+from profiling import ProfilingMiddleware
+from static_assets import PrecompressedStaticFiles, StaticPageCache, asset_url
+from write_coordinator import write_coordinator
 import crud
 
+def warm_up():
+    """Build AI/search clients and touch the database before serving traffic"""
+    from sqlalchemy import text
+    from services.ai_service import get_model
+    from services.chat_service import get_client
+    from services.web_search import get_tavily_client
+
+    get_model()
+    get_client()
+    get_tavily_client()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT COUNT(*) FROM medicines"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Check database on startup, then create any missing tables
+    if not check_database_exists():
+        print("Warning: medicines.db not found. Please ensure the database file exists.")
+    else:
+        print("Database connection established successfully.")
+    init_db()
+
+    if FAULT_STUBS:
+        from services.fault_stubs import install_fault_stubs
+        install_fault_stubs()
+
+    if WARMUP_ON_STARTUP:
+        await asyncio.to_thread(warm_up)
+        print("Warm-up completed.")
+
+    # Single writer thread that group-commits create/update/delete requests
+    write_coordinator.start()
+    yield
+    write_coordinator.stop()
+
 # Create FastAPI app
 app = FastAPI(
     title="Medicine Inventory System",
     description="Premium medicine inventory management system with advanced search",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Request, SQL and external call instrumentation
+app.add_middleware(MetricsMiddleware)
+# Opt-in per-request profiling (X-Profile-Token header, or _profile=1 with X-Admin-Token)
+app.add_middleware(ProfilingMiddleware)
+
+# Mount static files (fingerprinted, precompressed copies live in static/dist; see build_assets.py)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 app.include_router(prescription_router, tags=["Prescriptions"])
 app.include_router(chatbot_router, tags=["Chatbot"])
+app.include_router(admin_router, tags=["Admin"])
 
 # Templates
 templates = Jinja2Templates(directory="templates")
-
-# Check database on startup
-@app.on_event("startup")
-async def startup_event():
-    if not check_database_exists():
-        print("Warning: medicines.db not found. Please ensure the database file exists.")
-    else:
-        print("Database connection established successfully.")
+templates.env.globals["asset_url"] = asset_url
+# The landing, inventory and upload pages take no data, so each is rendered once
+static_pages = StaticPageCache(templates, enabled=STATIC_PAGE_CACHE)
 
 # Root endpoint - Serve the landing page
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("landing.html", {"request": request})
+    return static_pages.response(request, "landing.html")
 
 # Additional Pages
 @app.get("/landing", response_class=HTMLResponse)
 async def landing_page(request: Request):
-    return templates.TemplateResponse("landing.html", {"request": request})
+    return static_pages.response(request, "landing.html")
 
 @app.get("/inventory", response_class=HTMLResponse)
 async def inventory_page(request: Request):
-    return templates.TemplateResponse("inventory.html", {"request": request})
+    return static_pages.response(request, "inventory.html")
 
 @app.get("/upload", response_class=HTMLResponse)
 async def upload_prescription_page(request: Request):
-    return templates.TemplateResponse("upload.html", {"request": request})
+    return static_pages.response(request, "upload.html")
 
 # @app.get("/chatbot", response_class=HTMLResponse)
 # async def chatbot_page(request: Request):
@@ -103,9 +147,15 @@ async def search_medicines(
     sort_order: str = "asc",
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    facets: Optional[str] = Query(None, description="Comma-separated facets: type, dosage_form, manufacturer, price"),
     db: Session = Depends(get_db)
 ):
-    """Advanced search with multiple filters"""
+    """Advanced search with multiple filters and optional facet counts"""
+    requested_facets = [f.strip() for f in facets.split(",") if f.strip()] if facets else []
+    unknown_facets = set(requested_facets) - set(crud.FACET_COLUMNS) - {crud.PRICE_FACET}
+    if unknown_facets:
+        raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(sorted(unknown_facets))}")
+
     try:
         search_params = MedicineSearch(
             query=query,
@@ -120,14 +170,16 @@ async def search_medicines(
             per_page=per_page
         )
         
-        medicines, total = crud.search_medicines(db, search_params)
+        result = crud.search_medicines_cached(db, search_params, requested_facets)
+        total = result["total"]
         
         return SearchResponse(
-            medicines=medicines,
+            medicines=result["medicines"],
             total=total,
             page=page,
             per_page=per_page,
-            total_pages=(total + per_page - 1) // per_page
+            total_pages=(total + per_page - 1) // per_page,
+            facets=result["facets"]
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -141,32 +193,28 @@ async def get_medicine(medicine_id: int, db: Session = Depends(get_db)):
     return medicine
 
 @app.post("/api/medicines", response_model=MedicineResponse)
-async def create_medicine(
-    medicine: MedicineCreate, 
-    db: Session = Depends(get_db)
-):
+async def create_medicine(medicine: MedicineCreate):
     """Create a new medicine"""
     try:
-        return crud.create_medicine(db, medicine)
+        return await write_coordinator.run(crud.apply_create_medicine, medicine)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/medicines/{medicine_id}", response_model=MedicineResponse)
 async def update_medicine(
     medicine_id: int, 
-    medicine: MedicineUpdate, 
-    db: Session = Depends(get_db)
+    medicine: MedicineUpdate
 ):
     """Update an existing medicine"""
-    db_medicine = crud.update_medicine(db, medicine_id, medicine)
+    db_medicine = await write_coordinator.run(crud.apply_update_medicine, medicine_id, medicine)
     if db_medicine is None:
         raise HTTPException(status_code=404, detail="Medicine not found")
     return db_medicine
 
 @app.delete("/api/medicines/{medicine_id}")
-async def delete_medicine(medicine_id: int, db: Session = Depends(get_db)):
+async def delete_medicine(medicine_id: int):
     """Delete a medicine"""
-    success = crud.delete_medicine(db, medicine_id)
+    success = await write_coordinator.run(crud.apply_delete_medicine, medicine_id)
     if not success:
         raise HTTPException(status_code=404, detail="Medicine not found")
     return {"message": "Medicine deleted successfully"}
@@ -183,7 +231,7 @@ async def get_statistics(db: Session = Depends(get_db)):
 async def get_filter_options(db: Session = Depends(get_db)):
     """Get filter options for search interface"""
     try:
-        return crud.get_filter_options(db)
+        return crud.get_filter_options_cached(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -219,5 +267,11 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "database": check_database_exists()}
 
+# Prometheus metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose request, SQL and external call metrics in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
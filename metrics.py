@@ -0,0 +1,295 @@
+"""
+Lightweight, always-on instrumentation exposed in Prometheus text format.
+
+Covers HTTP requests (via MetricsMiddleware), SQL statements (via
+instrument_engine) and external AI/search calls (via track_external).
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from config.load_env import SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_SECONDS = SLOW_QUERY_MS / 1000
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+EXTERNAL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    """Base class holding label names and a per-label-set value map"""
+
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _format_labels(self, labelvalues, extra=None):
+        pairs = list(zip(self.labelnames, labelvalues))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in sorted(items):
+            lines.extend(self._render_sample(labelvalues, value))
+        return lines
+
+    def _render_sample(self, labelvalues, value):
+        return [f"{self.name}{self._format_labels(labelvalues)} {value}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount=1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=HTTP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _render_sample(self, labelvalues, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            lines.append(f"{self.name}_bucket{self._format_labels(labelvalues, ('le', le))} {cumulative}")
+        labels = self._format_labels(labelvalues)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Register a callable run right before rendering (e.g. to refresh gauges)"""
+        self._collectors.append(collector)
+
+    def render(self):
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route and status code", ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"))
+
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement execution time in seconds", ("operation",), SQL_BUCKETS))
+db_slow_queries_total = registry.register(Counter(
+    "db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS", ("operation",)))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",), COUNT_BUCKETS))
+
+external_calls_total = registry.register(Counter(
+    "external_calls_total", "Calls to external AI/search providers", ("provider", "operation", "outcome")))
+external_call_duration_seconds = registry.register(Histogram(
+    "external_call_duration_seconds", "External AI/search call latency in seconds",
+    ("provider", "operation"), EXTERNAL_BUCKETS))
+
+# Number of SQL statements run by the current request, None outside a request
+_request_query_count = ContextVar("request_query_count", default=None)
+
+# Per-request trace filled only while a request is being profiled
+request_trace = ContextVar("request_trace", default=None)
+
+
+def traced(fn):
+    """
+    Wrap `fn` so that, while it runs on a worker thread for a profiled
+    request, the profiler samples that thread too. The request's context
+    must reach the thread (asyncio.to_thread and copy_context().run do this).
+    """
+    def wrapper(*args, **kwargs):
+        trace = request_trace.get()
+        if trace is None:
+            return fn(*args, **kwargs)
+        thread_id = threading.get_ident()
+        trace["threads"][thread_id] = threading.current_thread().name
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            trace["threads"].pop(thread_id, None)
+    return wrapper
+
+
+def render_metrics():
+    """Render every registered metric in Prometheus text exposition format"""
+    return registry.render()
+
+
+def _route_label(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, in-flight requests and status codes"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        query_count = [0]
+        token = _request_query_count.set(query_count)
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            _request_query_count.reset(token)
+            route = _route_label(scope)
+            method = scope["method"]
+            http_requests_total.inc(method, route, str(status["code"]))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            db_queries_per_request.observe(query_count[0], route)
+
+
+def _statement_operation(statement):
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def instrument_engine(engine):
+    """Attach per-statement timing, per-request counts and the slow-query log to an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        operation = _statement_operation(statement)
+        db_query_duration_seconds.observe(elapsed, operation)
+
+        query_count = _request_query_count.get()
+        if query_count is not None:
+            query_count[0] += 1
+
+        trace = request_trace.get()
+        if trace is not None:
+            trace["sql"].append({"statement": statement, "duration_ms": round(elapsed * 1000, 3)})
+
+        if elapsed >= SLOW_QUERY_SECONDS:
+            db_slow_queries_total.inc(operation)
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # after_cursor_execute doesn't fire for a failed statement; drop its start time
+        conn = exception_context.connection
+        if conn is not None and exception_context.execution_context is not None:
+            start_times = conn.info.get("query_start_time")
+            if start_times:
+                start_times.pop()
+
+
+@contextmanager
+def track_external(provider, operation):
+    """Count and time a call to an external provider (e.g. "gemini", "tavily")"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        external_calls_total.inc(provider, operation, outcome)
+        external_call_duration_seconds.observe(elapsed, provider, operation)
+        trace = request_trace.get()
+        if trace is not None:
+            trace["external"].append({
+                "provider": provider,
+                "operation": operation,
+                "outcome": outcome,
+                "duration_ms": round(elapsed * 1000, 3),
+            })
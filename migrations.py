@@ -0,0 +1,67 @@
+"""
+Schema migrations for existing catalog databases.
+
+migrate_to_lookup_tables() converts the original medicines table, which
+stored type, dosage_form, generic and manufacturer as repeated strings on
+every row, to the lookup-table layout in models.py. It runs from init_db()
+and does nothing on databases that are already migrated (or empty).
+"""
+
+from sqlalchemy import text
+
+from database import Base
+from models import Medicine, LOOKUP_FIELDS
+
+LEGACY_TABLE = "medicines_legacy"
+
+
+def medicine_columns(connection):
+    """Column names of the medicines table, or an empty set if it doesn't exist"""
+    rows = connection.execute(text(f"PRAGMA table_info({Medicine.__tablename__})"))
+    return {row[1] for row in rows}
+
+
+def needs_lookup_migration(connection):
+    columns = medicine_columns(connection)
+    return "manufacturer" in columns and "manufacturer_id" not in columns
+
+
+def migrate_to_lookup_tables(engine):
+    """Move string categorical columns into lookup tables; returns True if anything changed"""
+    with engine.begin() as connection:
+        if not needs_lookup_migration(connection):
+            return False
+
+        connection.execute(text(f"ALTER TABLE {Medicine.__tablename__} RENAME TO {LEGACY_TABLE}"))
+        Base.metadata.create_all(bind=connection)
+
+        # One lookup row per distinct value, NULL included, so every key can be set
+        for field, model in LOOKUP_FIELDS.items():
+            connection.execute(text(
+                f"INSERT INTO {model.__tablename__} (name) "
+                f"SELECT DISTINCT {field} FROM {LEGACY_TABLE} ORDER BY {field}"
+            ))
+
+        plain_columns = [
+            column.name for column in Medicine.__table__.columns
+            if not column.name.endswith("_id") or column.name == "brand_id"
+        ]
+        key_columns = [f"{field}_id" for field in LOOKUP_FIELDS]
+        joins = " ".join(
+            f"JOIN {model.__tablename__} AS lookup_{field} ON lookup_{field}.name IS legacy.{field}"
+            for field, model in LOOKUP_FIELDS.items()
+        )
+        connection.execute(text(
+            f"INSERT INTO {Medicine.__tablename__} ({', '.join(plain_columns + key_columns)}) "
+            f"SELECT {', '.join(f'legacy.{column}' for column in plain_columns)}, "
+            f"{', '.join(f'lookup_{field}.id' for field in LOOKUP_FIELDS)} "
+            f"FROM {LEGACY_TABLE} AS legacy {joins}"
+        ))
+        migrated = connection.execute(text(f"SELECT COUNT(*) FROM {Medicine.__tablename__}")).scalar()
+        connection.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+
+    # Reclaim the space the repeated strings and their indexes used
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM"))
+    print(f"Migrated {migrated} medicines to lookup tables")
+    return True
@@ -1,26 +1,82 @@
-from sqlalchemy import Column, Integer, String, Float, create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy.orm import relationship
+from database import Base
 
-Base = declarative_base()
+class Manufacturer(Base):
+    """Lookup table of manufacturer names"""
+    __tablename__ = "manufacturers"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True)
+
+class MedicineType(Base):
+    """Lookup table of medicine types (allopathic, herbal, ...)"""
+    __tablename__ = "medicine_types"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True)
+
+class DosageForm(Base):
+    """Lookup table of dosage forms"""
+    __tablename__ = "dosage_forms"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True)
+
+class Generic(Base):
+    """Lookup table of generic names"""
+    __tablename__ = "generics"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True)
+
+# Medicine attributes stored as <field>_id keys into a lookup table. A missing
+# value points at the lookup row whose name is NULL, so every key is set and
+# joins never drop rows.
+LOOKUP_FIELDS = {
+    "type": MedicineType,
+    "dosage_form": DosageForm,
+    "generic": Generic,
+    "manufacturer": Manufacturer,
+}
+
+def _lookup_name(field):
+    """Read-only attribute exposing the looked-up name (set <field>_ref to change it)"""
+    relationship_name = f"{field}_ref"
+
+    def getter(self):
+        entry = getattr(self, relationship_name)
+        return entry.name if entry is not None else None
+
+    return property(getter)
 
 class Medicine(Base):
-    """Medicine model for the inventory system"""
+    """Medicine model for the inventory system (secondary indexes live in indexes.py)"""
     __tablename__ = "medicines"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    brand_id = Column(Integer, index=True)
-    brand_name = Column(String, index=True)
-    type = Column(String, index=True)
+
+    id = Column(Integer, primary_key=True)
+    brand_id = Column(Integer)
+    brand_name = Column(String)
+    type_id = Column(Integer, ForeignKey("medicine_types.id"), nullable=False)
     slug = Column(String)
-    dosage_form = Column(String, index=True)
-    generic = Column(String, index=True)
+    dosage_form_id = Column(Integer, ForeignKey("dosage_forms.id"), nullable=False)
+    generic_id = Column(Integer, ForeignKey("generics.id"), nullable=False)
     strength = Column(String)
-    manufacturer = Column(String, index=True)
+    manufacturer_id = Column(Integer, ForeignKey("manufacturers.id"), nullable=False)
     package_container = Column(String)
     package_size = Column(String)
     price = Column(Float)
-    
+
+    type_ref = relationship(MedicineType, lazy="joined", innerjoin=True)
+    dosage_form_ref = relationship(DosageForm, lazy="joined", innerjoin=True)
+    generic_ref = relationship(Generic, lazy="joined", innerjoin=True)
+    manufacturer_ref = relationship(Manufacturer, lazy="joined", innerjoin=True)
+
+    type = _lookup_name("type")
+    dosage_form = _lookup_name("dosage_form")
+    generic = _lookup_name("generic")
+    manufacturer = _lookup_name("manufacturer")
+
     def to_dict(self):
         """Convert model to dictionary"""
         return {
@@ -37,7 +93,3 @@ class Medicine(Base):
             'package_size': self.package_size,
             'price': self.price
         }
-
-# Create tables (if needed)
-engine = create_engine("sqlite:///./medicines.db", connect_args={"check_same_thread": False})
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+On-demand, per-request sampling profiler.
+
+A request is profiled only when it carries the admin token in the
+X-Profile-Token header, or sets the _profile query flag (e.g. ?_profile=1)
+and carries the token in the X-Admin-Token header. The token itself never
+goes in the URL, where access logs would record it. The event-loop
+thread is sampled while the request runs, along with any worker thread
+running the request's work through metrics.traced (asyncio.to_thread calls
+and external provider calls). The result is stored as collapsed stacks
+(flamegraph.pl / speedscope compatible), each rooted at its thread's name,
+together with the SQL statements and external calls made by that request.
+"""
+
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode
+
+from config.load_env import (
+    ADMIN_TOKEN,
+    PROFILE_DIR,
+    PROFILE_MIN_INTERVAL,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILE_MAX_STORED,
+)
+from metrics import request_trace
+
+SAMPLE_INTERVAL = PROFILE_SAMPLE_INTERVAL_MS / 1000
+MAX_STORED_PROFILES = PROFILE_MAX_STORED
+PROFILE_HEADER = b"x-profile-token"
+ADMIN_HEADER = b"x-admin-token"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+_rate_limit_lock = threading.Lock()
+_last_profile_started = 0.0
+
+
+class _StackSampler(threading.Thread):
+    """Periodically records the call stacks of one thread plus the trace's worker threads"""
+
+    def __init__(self, thread_id, thread_name, trace, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.thread_name = thread_name
+        self.trace = trace
+        self.interval = interval
+        self.stacks = Counter()
+        self.thread_names = {thread_name}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            threads = dict(self.trace["threads"])
+            threads[self.thread_id] = self.thread_name
+            for thread_id, name in threads.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.thread_names.add(name)
+                    self.stacks[f"thread {name};{_collapse(frame)}"] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame):
+    """Root-first `a;b;c` representation of a frame's stack"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _requested_token(scope):
+    """Token sent with a profiling request ("" if none was sent), or None when profiling wasn't asked for"""
+    headers = dict(scope["headers"])
+    if PROFILE_HEADER in headers:
+        return headers[PROFILE_HEADER].decode("latin-1")
+    query_string = scope.get("query_string", b"")
+    if PROFILE_QUERY_PARAM.encode() in query_string:
+        query = dict(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+        if PROFILE_QUERY_PARAM in query:
+            return headers.get(ADMIN_HEADER, b"").decode("latin-1")
+    return None
+
+
+def _acquire_slot():
+    """Allow at most one profile per PROFILE_MIN_INTERVAL seconds per process"""
+    global _last_profile_started
+    with _rate_limit_lock:
+        now = time.monotonic()
+        if _last_profile_started and now - _last_profile_started < PROFILE_MIN_INTERVAL:
+            return False
+        _last_profile_started = now
+        return True
+
+
+def _profile_path(profile_id):
+    return os.path.join(PROFILE_DIR, f"{profile_id}.json")
+
+
+def _prune_profiles():
+    files = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in files[:-MAX_STORED_PROFILES]:
+        os.remove(entry.path)
+
+
+def _save_profile(profile):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(_profile_path(profile["id"]), "w") as f:
+        json.dump(profile, f)
+    _prune_profiles()
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles explicitly flagged requests only"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not ADMIN_TOKEN or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _requested_token(scope)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        authorized = hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+        if not authorized or not _acquire_slot():
+            reason = b"rate-limited" if authorized else b"forbidden"
+            await self.app(scope, receive, _with_headers(send, [(b"x-profile-skipped", reason)]))
+            return
+
+        await self._profile(scope, receive, send)
+
+    async def _profile(self, scope, receive, send):
+        profile_id = uuid.uuid4().hex
+        status = {"code": 500}
+        extra_headers = [(b"x-profile-id", profile_id.encode())]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await _with_headers(send, extra_headers)(message)
+
+        trace = {"sql": [], "external": [], "threads": {}}
+        trace_token = request_trace.set(trace)
+        sampler = _StackSampler(threading.get_ident(), threading.current_thread().name, trace, SAMPLE_INTERVAL)
+        started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            request_trace.reset(trace_token)
+            query = [(k, v) for k, v in parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+                     if k != PROFILE_QUERY_PARAM]
+            _save_profile({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": urlencode(query),
+                "status": status["code"],
+                "started_at": started_at,
+                "duration_ms": round(duration_ms, 3),
+                "sample_interval_ms": SAMPLE_INTERVAL * 1000,
+                "samples": sum(sampler.stacks.values()),
+                "threads": sorted(sampler.thread_names),
+                "stacks": dict(sampler.stacks),
+                "sql": trace["sql"],
+                "sql_total_ms": round(sum(q["duration_ms"] for q in trace["sql"]), 3),
+                "external": trace["external"],
+                "external_total_ms": round(sum(c["duration_ms"] for c in trace["external"]), 3),
+            })
+
+
+def _with_headers(send, headers):
+    async def wrapper(message):
+        if message["type"] == "http.response.start":
+            message = dict(message)
+            message["headers"] = list(message.get("headers", [])) + headers
+        await send(message)
+    return wrapper
+
+
+def load_profile(profile_id):
+    """Load a stored profile by id, or None if it does not exist"""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(_profile_path(profile_id)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_profiles():
+    """Summaries of stored profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    summaries = []
+    for entry in os.scandir(PROFILE_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        profile = load_profile(entry.name[:-len(".json")])
+        if profile:
+            summaries.append({key: profile[key] for key in (
+                "id", "method", "path", "query", "status", "started_at", "duration_ms", "samples")})
+    return sorted(summaries, key=lambda summary: summary["started_at"], reverse=True)
+
+
+def to_collapsed(profile):
+    """Brendan Gregg collapsed-stack text (one `stack count` line per stack)"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(profile["stacks"].items()))
+
+
+def to_speedscope(profile):
+    """Speedscope sampled-profile JSON document"""
+    frames, frame_index, samples, weights = [], {}, [], []
+    for stack, count in profile["stacks"].items():
+        indexes = []
+        for name in stack.split(";"):
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({"name": name})
+            indexes.append(frame_index[name])
+        samples.append(indexes)
+        weights.append(count * profile["sample_interval_ms"])
+    title = f"{profile['method']} {profile['path']}"
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": title,
+        "exporter": "medscribe",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": title,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
@@ -0,0 +1,61 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from config.load_env import ADMIN_TOKEN
+import profiling
+from search_cache import search_cache
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    """Reject requests without the configured admin token"""
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+def _get_profile(profile_id: str):
+    profile = profiling.load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@admin_router.get("/profiles")
+async def list_profiles():
+    """List stored request profiles, newest first"""
+    return {"profiles": profiling.list_profiles()}
+
+
+@admin_router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Full profile including stacks, SQL statements and external calls"""
+    return _get_profile(profile_id)
+
+
+@admin_router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_collapsed(profile_id: str):
+    """Collapsed stacks for flamegraph.pl / inferno / speedscope"""
+    return PlainTextResponse(profiling.to_collapsed(_get_profile(profile_id)))
+
+
+@admin_router.get("/profiles/{profile_id}/speedscope")
+async def get_profile_speedscope(profile_id: str):
+    """Profile in speedscope's JSON file format"""
+    return profiling.to_speedscope(_get_profile(profile_id))
+
+
+@admin_router.get("/search-cache")
+async def get_search_cache_stats():
+    """Catalog result cache size and hit ratio"""
+    return search_cache.stats()
+
+
+@admin_router.delete("/search-cache")
+async def clear_search_cache():
+    """Drop every cached search / filter-options result"""
+    search_cache.clear()
+    return search_cache.stats()
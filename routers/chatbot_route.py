@@ -1,29 +1,54 @@
 
 from fastapi import APIRouter, Request
+import asyncio
 from fastapi.responses import JSONResponse, HTMLResponse
 from pydantic import BaseModel
 from fastapi.templating import Jinja2Templates
-from services.chat_service import create_chat
+from services.chat_service import send_chat_message
+from services.answer_cache import answer_cache
+from services.resilience import request_budget, ExternalServiceError
+from metrics import traced
+from config.load_env import CHAT_REQUEST_BUDGET
+from session_store import get_session_id, get_context_store
 
 templates = Jinja2Templates(directory="templates")
 chatbot_router = APIRouter()
 
 class ChatMessage(BaseModel):
     message: str
+    bypass_cache: bool = False
 
 # POST endpoint for chat messages (replaces websocket)
 @chatbot_router.post("/chatbot/message")
 async def chat_message(request: Request, chat: ChatMessage):
-    medicine_information = getattr(request.app.state, "medicine_information", None)
+    session_id = get_session_id(request)
+    medicine_information = get_context_store().get(session_id) if session_id else None
+    if chat.bypass_cache:
+        answer_cache.record_bypass()
+    else:
+        cached = answer_cache.get(medicine_information, chat.message)
+        if cached is not None:
+            answer, provenance = cached
+            return JSONResponse(content={"response": answer, "cached": True, "provenance": provenance})
     try:
-        response = create_chat(medicine_information).send_message(message=chat.message).text
-        return JSONResponse(content={"response": response})
+        with request_budget(CHAT_REQUEST_BUDGET):
+            response = await asyncio.to_thread(traced(send_chat_message), medicine_information, chat.message)
+        answer_cache.set(medicine_information, chat.message, response)
+        return JSONResponse(content={"response": response, "cached": False})
+    except ExternalServiceError as e:
+        # A bypassed cache entry is still better than no answer
+        cached = answer_cache.get(medicine_information, chat.message) if chat.bypass_cache else None
+        if cached is not None:
+            answer, provenance = cached
+            return JSONResponse(content={"response": answer, "cached": True, "provenance": provenance})
+        return JSONResponse(
+            content={"error": f"The assistant is temporarily unavailable, please try again shortly ({e})"},
+            status_code=503,
+        )
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
 @chatbot_router.get("/chatbot", response_class=HTMLResponse)
 async def chatbot_page(request: Request):
-    request.app.state.medicine_information = getattr(request.app.state, "extra_info_prompt", None)
-
     return templates.TemplateResponse("chatbot.html", {"request": request})
 
@@ -1,25 +1,37 @@
-from fastapi import APIRouter, UploadFile, Request
+
+from fastapi import APIRouter, UploadFile, Request, Response, HTTPException
+import asyncio
 import base64
+from config.load_env import EXTRACT_REQUEST_BUDGET
 from services.ai_service import ExtractMedicineInfo
+from services.resilience import request_budget, ExternalServiceError
+from metrics import traced
+from session_store import ensure_session_id, get_context_store
 
 
 prescription_router = APIRouter()
 
 @prescription_router.post("/explain-image/")
-async def explain_image(file: UploadFile, request: Request):
+async def explain_image(file: UploadFile, request: Request, response: Response):
     """
     Takes an image file and returns an AI-generated explanation.
     """
+    session_id = ensure_session_id(request, response)
+
     # Read the uploaded image
     image_bytes = await file.read()
 
     # Convert image to base64 for LangChain
     image_base64 = base64.b64encode(image_bytes).decode("utf-8")
 
-    # Create input for multimodal model
-    response = ExtractMedicineInfo(image_base64)
+    # Create input for multimodal model, off the event loop and within the request budget
+    try:
+        with request_budget(EXTRACT_REQUEST_BUDGET):
+            extracted_info = await asyncio.to_thread(traced(ExtractMedicineInfo), image_base64)
+    except ExternalServiceError as e:
+        raise HTTPException(status_code=503, detail=f"Prescription analysis is temporarily unavailable ({e})")
 
-    # Store the response in the request state
-    request.app.state.extra_info_prompt = response
+    # Store the prescription for this session's chatbot
+    get_context_store().set(session_id, extracted_info)
 
-    return response
+    return extracted_info
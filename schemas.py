@@ -44,6 +44,24 @@ class MedicineSearch(BaseModel):
     page: int = 1
     per_page: int = 20
 
+class FacetCount(BaseModel):
+    """Number of matching medicines with a given facet value"""
+    value: str
+    count: int
+
+class PriceBucketCount(BaseModel):
+    """Number of matching medicines priced in [min, max); max is None for the last bucket"""
+    min: float
+    max: Optional[float] = None
+    count: int
+
+class SearchFacets(BaseModel):
+    """Facet counts over the filtered search results, each ignoring its own filter"""
+    type: Optional[List[FacetCount]] = None
+    dosage_form: Optional[List[FacetCount]] = None
+    manufacturer: Optional[List[FacetCount]] = None
+    price: Optional[List[PriceBucketCount]] = None
+
 class SearchResponse(BaseModel):
     """Schema for search response"""
     medicines: List[MedicineResponse]
@@ -51,6 +69,7 @@ class SearchResponse(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    facets: Optional[SearchFacets] = None
 
 class MedicineStats(BaseModel):
     """Schema for medicine statistics"""
@@ -0,0 +1,174 @@
+"""
+In-process cache for catalog read results (search pages, filter options).
+
+Entries are plain JSON-serializable dicts, evicted least-recently-used once
+their combined serialized size passes max_bytes, and optionally expired
+after a TTL. Writes through crud.py invalidate the whole cache; writes from
+other processes (e.g. a re-import with data_import.py) are picked up by
+watching the database files' modification stamps, so a hit never touches
+the database.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config.load_env import SEARCH_CACHE_MAX_BYTES, SEARCH_CACHE_TTL
+from database import DATABASE_PATH
+from metrics import registry, Counter, Gauge
+
+search_cache_lookups_total = registry.register(Counter(
+    "search_cache_lookups_total", "Catalog result cache lookups by kind and result", ("kind", "result")))
+search_cache_evictions_total = registry.register(Counter(
+    "search_cache_evictions_total", "Catalog result cache entries dropped, by reason", ("reason",)))
+search_cache_entries = registry.register(Gauge(
+    "search_cache_entries", "Entries currently held in the catalog result cache"))
+search_cache_bytes = registry.register(Gauge(
+    "search_cache_bytes", "Approximate serialized size of the catalog result cache"))
+search_cache_hit_ratio = registry.register(Gauge(
+    "search_cache_hit_ratio", "Catalog result cache hits / lookups since startup"))
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ResultCache:
+    """Size-bounded LRU with optional TTL and generation-based invalidation"""
+
+    def __init__(self, max_bytes=SEARCH_CACHE_MAX_BYTES, ttl=SEARCH_CACHE_TTL, database_path=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.database_path = database_path
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._generation = 0
+        self._database_stamp = self._current_database_stamp()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        registry.add_collector(self._collect)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get_or_compute(self, kind, key, compute):
+        """Return the cached value for (kind, key), computing and storing it on a miss"""
+        if not self.enabled:
+            return compute()
+
+        key = (kind, key)
+        now = time.time()
+        with self._lock:
+            self._check_database_stamp()
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= now:
+                self._remove(key)
+                search_cache_evictions_total.inc("ttl")
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                search_cache_lookups_total.inc(kind, "hit")
+                return entry[0]
+            self._misses += 1
+            generation = self._generation
+        search_cache_lookups_total.inc(kind, "miss")
+
+        value = compute()
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            # A write that landed while computing makes this result stale
+            if generation == self._generation and size <= self.max_bytes:
+                self._store(key, value, size, now)
+        return value
+
+    def invalidate(self, reason="write"):
+        """Drop every entry and reject results computed before this call"""
+        with self._lock:
+            self._invalidate(reason)
+
+    def clear(self):
+        self.invalidate("manual")
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl or None,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _store(self, key, value, size, now):
+        if key in self._entries:
+            self._remove(key)
+        expires_at = now + self.ttl if self.ttl else None
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            search_cache_evictions_total.inc("size")
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _invalidate(self, reason):
+        if self._entries:
+            search_cache_evictions_total.inc(reason, amount=len(self._entries))
+        self._entries.clear()
+        self._bytes = 0
+        self._generation += 1
+
+    def _current_database_stamp(self):
+        if not self.database_path:
+            return None
+        return _file_stamp(self.database_path), _file_stamp(f"{self.database_path}-wal")
+
+    def _check_database_stamp(self):
+        stamp = self._current_database_stamp()
+        if stamp != self._database_stamp:
+            self._database_stamp = stamp
+            self._invalidate("database_changed")
+
+    def _collect(self):
+        stats = self.stats()
+        search_cache_entries.set(stats["entries"])
+        search_cache_bytes.set(stats["bytes"])
+        search_cache_hit_ratio.set(stats["hit_ratio"])
+
+
+def canonical_search_key(search_params, facets=()):
+    """
+    Hashable key for a MedicineSearch: empty strings count as unset, text
+    matching ignores ASCII case (like SQLite's LIKE and NOCASE) and facet
+    order doesn't matter.
+    """
+    params = search_params.model_dump()
+    for field in ("query", "type", "dosage_form"):
+        value = params[field] or None
+        params[field] = value.lower() if value and value.isascii() else value
+    for field in ("min_price", "max_price"):
+        if params[field] is not None:
+            params[field] = float(params[field])
+    if not params["query"]:
+        params["search_type"] = None
+    params["sort_order"] = "desc" if params["sort_order"] == "desc" else "asc"
+    return tuple(sorted(params.items())) + (("facets", tuple(sorted(set(facets)))),)
+
+
+search_cache = ResultCache(database_path=DATABASE_PATH)
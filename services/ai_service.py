@@ -1,32 +1,76 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 from services.output_format import ExtractInfo
 from services.web_search import find_best_medicine_match
+from services.resilience import gemini, ExternalServiceError
 from config.load_env import GEMINI_MODEL, GOOGLE_API_KEY
 
+# Recent extraction results by image hash, served when Gemini is unavailable
+_recent_extractions = OrderedDict()
+_RECENT_EXTRACTIONS_LIMIT = 256
+_recent_extractions_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_model():
+    """Structured-output capable Gemini model, created on first use."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=GEMINI_MODEL, 
+                                  api_key = GOOGLE_API_KEY,
+                                  temperature=0.0,)
 
-model = ChatGoogleGenerativeAI(model=GEMINI_MODEL, 
-                             api_key = GOOGLE_API_KEY,
-                             temperature=0.0,)
+def resolve_medicine_name(fullname: str, extracted_name: str):
+    """
+    Verify the LLM's medicine name against web search results.
+
+    Falls back to the raw extracted name, marked unverified, when the search
+    provider is slow, rate limited or failing.
+    """
+    try:
+        return find_best_medicine_match(fullname, extracted_name), True
+    except ExternalServiceError as e:
+        print(f"Medicine name resolution skipped for {extracted_name!r}: {e}")
+        return extracted_name, False
 
 def ExtractMedicineInfo(image_base64: str):
 
-    llm = model.with_structured_output(ExtractInfo)
-    llm_response = llm.invoke([
-            {"role": "user", "content": [
-                {"type": "text", "text": "Explain what is happening in this image in simple terms."},
-                {"type": "image_url", "image_url": f"data:image/jpeg;base64,{image_base64}"}
-            ]}
-        ])
+    image_key = hashlib.sha256(image_base64.encode("utf-8")).hexdigest()
+    llm = get_model().with_structured_output(ExtractInfo)
+    try:
+        llm_response = gemini.call("extract_medicines", llm.invoke, [
+                {"role": "user", "content": [
+                    {"type": "text", "text": "Explain what is happening in this image in simple terms."},
+                    {"type": "image_url", "image_url": f"data:image/jpeg;base64,{image_base64}"}
+                ]}
+            ])
+    except ExternalServiceError:
+        with _recent_extractions_lock:
+            cached = _recent_extractions.get(image_key)
+        if cached is not None:
+            return cached
+        raise
+
     response = {}
     for index, extracted_medicine_name in enumerate(llm_response.name):
-        medicine_name = find_best_medicine_match(llm_response.fullname[index], extracted_medicine_name)
+        medicine_name, verified = resolve_medicine_name(llm_response.fullname[index], extracted_medicine_name)
         strength_value = llm_response.strength[index] if index < len(llm_response.strength) else "N/A"
         dosage_type_value = llm_response.dosage_type[index] if index < len(llm_response.dosage_type) else "N/A"
         response[f"medicine_{index+1}"] = {
             "name": medicine_name,
             "strength": strength_value,
             "dosage_type": dosage_type_value,
+            "verified": verified,
         }
 
+    with _recent_extractions_lock:
+        _recent_extractions[image_key] = response
+        _recent_extractions.move_to_end(image_key)
+        while len(_recent_extractions) > _RECENT_EXTRACTIONS_LIMIT:
+            _recent_extractions.popitem(last=False)
+
     return response
 
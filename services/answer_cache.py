@@ -0,0 +1,172 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from rapidfuzz import fuzz, process
+
+from config.load_env import (
+    GEMINI_MODEL,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_MATCH_THRESHOLD,
+)
+from metrics import registry, Counter, Gauge
+
+answer_cache_lookups_total = registry.register(Counter(
+    "chatbot_answer_cache_lookups_total", "Chatbot answer cache lookups by result", ("result",)))
+answer_cache_entries = registry.register(Gauge(
+    "chatbot_answer_cache_entries", "Answers currently held in the chatbot answer cache"))
+
+
+def normalize_question(question: str) -> str:
+    """
+    Lowercase, drop punctuation and collapse whitespace so trivially different
+    phrasings ("Side effects of Napa?" / "side effects of napa") share a key.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+# Words that flip or qualify a medical answer while barely moving a fuzzy score
+QUALIFIER_WORDS = {
+    "not", "no", "never", "without", "cannot", "cant", "dont", "nor", "neither", "none",
+    "before", "after",
+}
+
+
+def question_signature(normalized: str):
+    """
+    Numbers and qualifier words of a normalized question. Near matches must
+    agree on these exactly: "napa 500" isn't "napa 250", and "with alcohol"
+    isn't "without alcohol".
+    """
+    tokens = normalized.split()
+    numbers = frozenset(re.findall(r"\d+", normalized))
+    qualifiers = {token for token in tokens if token in QUALIFIER_WORDS}
+    # Contractions lose their apostrophe in normalize_question: "can't" -> "can t"
+    if "t" in tokens:
+        qualifiers.add("not")
+    return numbers, frozenset(qualifiers)
+
+
+def normalize_context(medicine_information) -> str:
+    """
+    Stable key for a prescription: medicine order, case and spacing are ignored.
+    """
+    if not medicine_information:
+        return ""
+    if isinstance(medicine_information, dict):
+        medicines = sorted(
+            tuple(" ".join(str(medicine.get(field, "")).lower().split())
+                  for field in ("name", "strength", "dosage_type"))
+            for medicine in medicine_information.values()
+            if isinstance(medicine, dict)
+        )
+        canonical = json.dumps(medicines)
+    else:
+        canonical = " ".join(str(medicine_information).lower().split())
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """
+    LRU/TTL cache of chatbot answers keyed on (prescription, question).
+
+    Questions about the same prescription are matched exactly first and then
+    by fuzzy similarity, so near-duplicate phrasings are answered from cache.
+    A near match must share the question's numbers and qualifier words (see
+    question_signature).
+    """
+
+    def __init__(self, ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX_ENTRIES,
+                 match_threshold=ANSWER_CACHE_MATCH_THRESHOLD):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.match_threshold = match_threshold
+        self._entries = OrderedDict()  # (context_key, question) -> entry
+        self._questions = {}  # context_key -> set of questions
+        self._lock = threading.Lock()
+        registry.add_collector(lambda: answer_cache_entries.set(len(self._entries)))
+
+    def get(self, medicine_information, question):
+        """Return (answer, provenance) for a cached answer, or None"""
+        context_key = normalize_context(medicine_information)
+        normalized = normalize_question(question)
+        now = time.time()
+        with self._lock:
+            key = (context_key, normalized)
+            result = "hit"
+            if key not in self._entries:
+                key = self._closest_key(context_key, normalized)
+                result = "near_hit"
+            entry = self._entries.get(key) if key else None
+            if entry is not None and entry["expires_at"] <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                answer_cache_lookups_total.inc("miss")
+                return None
+            self._entries.move_to_end(key)
+            entry["hits"] += 1
+            answer_cache_lookups_total.inc(result)
+            provenance = {
+                "source_question": entry["source_question"],
+                "model": entry["model"],
+                "created_at": entry["created_at"],
+                "hits": entry["hits"],
+                "match": result,
+            }
+            return entry["answer"], provenance
+
+    def set(self, medicine_information, question, answer):
+        context_key = normalize_context(medicine_information)
+        key = (context_key, normalize_question(question))
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                "answer": answer,
+                "source_question": question,
+                "model": GEMINI_MODEL,
+                "created_at": now,
+                "expires_at": now + self.ttl,
+                "hits": 0,
+            }
+            self._questions.setdefault(context_key, set()).add(key[1])
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def record_bypass(self):
+        answer_cache_lookups_total.inc("bypass")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._questions.clear()
+
+    def _closest_key(self, context_key, normalized):
+        signature = question_signature(normalized)
+        candidates = [
+            question for question in self._questions.get(context_key, ())
+            if question_signature(question) == signature
+        ]
+        if not candidates:
+            return None
+        match = process.extractOne(
+            normalized, candidates, scorer=fuzz.token_sort_ratio, score_cutoff=self.match_threshold
+        )
+        return (context_key, match[0]) if match else None
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        questions = self._questions.get(key[0])
+        if questions is not None:
+            questions.discard(key[1])
+            if not questions:
+                del self._questions[key[0]]
+
+
+answer_cache = AnswerCache()
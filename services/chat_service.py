@@ -1,25 +1,41 @@
-from google import genai
-from google.genai import types
+from functools import lru_cache
 
 from config.load_env import GOOGLE_API_KEY, GEMINI_MODEL
-client = genai.Client(api_key=GOOGLE_API_KEY)
+from services.resilience import gemini
 
 
-# 1. Define web search tool
-grounding_tool = types.Tool(
-    google_search=types.GoogleSearch()
-)
+@lru_cache(maxsize=None)
+def get_client():
+    """Gemini API client, created on first use."""
+    from google import genai
+
+    return genai.Client(api_key=GOOGLE_API_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_grounding_tool():
+    """Web search tool used to ground chat answers."""
+    from google.genai import types
+
+    return types.Tool(
+        google_search=types.GoogleSearch()
+    )
 
 
 def create_chat(medicine_information):
-    chat = client.chats.create(
+    from google.genai import types
+
+    chat = get_client().chats.create(
     model=GEMINI_MODEL,
     config=types.GenerateContentConfig(
-            tools=[grounding_tool],
+            tools=[get_grounding_tool()],
             system_instruction=f"Here are the patient prescription information: {medicine_information}"
         )
     )
     return chat
 
 
-
+def send_chat_message(medicine_information, message: str) -> str:
+    """Ask the grounded chat model a question about the given prescription."""
+    chat = create_chat(medicine_information)
+    return gemini.call("chat", chat.send_message, message=message).text
@@ -0,0 +1,84 @@
+"""
+Local stand-ins for the Gemini and Tavily SDKs with injectable latency and errors.
+
+Enable with FAULT_STUBS=true (plus FAULT_STUB_LATENCY / FAULT_STUB_ERROR_RATE)
+to exercise deadlines, rate limits, circuit breakers and fallbacks without
+network access or API keys.
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+from config.load_env import FAULT_STUB_LATENCY, FAULT_STUB_ERROR_RATE
+from services.output_format import ExtractInfo
+
+
+class InjectedFault(Exception):
+    """Error raised on purpose by a fault-injecting stub"""
+
+
+class FaultInjector:
+    """Adds a fixed latency and fails a fraction of calls"""
+
+    def __init__(self, latency=FAULT_STUB_LATENCY, error_rate=FAULT_STUB_ERROR_RATE, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def __call__(self, operation):
+        if self.latency:
+            time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise InjectedFault(f"injected failure in {operation}")
+
+
+class StubTavilyClient:
+    def __init__(self, injector):
+        self.injector = injector
+
+    def search(self, query, **kwargs):
+        self.injector("tavily.search")
+        name = query.split()[1] if len(query.split()) > 1 else query
+        return {"results": [{"url": "https://medex.com.bd/brands/1", "title": f"{name} | Medex"}]}
+
+
+class StubStructuredModel:
+    def __init__(self, injector):
+        self.injector = injector
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, messages):
+        self.injector("gemini.extract_medicines")
+        return ExtractInfo(
+            fullname=["Tab. Napa 500 mg", "Cap. Maxpro 20 mg"],
+            name=["Napa", "Maxpro"],
+            dosage_type=["tablet", "capsule"],
+            strength=["500 mg", "20 mg"],
+        )
+
+
+class StubChat:
+    def __init__(self, injector, medicine_information):
+        self.injector = injector
+        self.medicine_information = medicine_information
+
+    def send_message(self, message):
+        self.injector("gemini.chat")
+        return SimpleNamespace(text=f"[stub] {message}")
+
+
+def install_fault_stubs(injector=None):
+    """Route every external AI/search call in services/ to local stubs"""
+    from services import ai_service, chat_service, web_search
+
+    injector = injector or FaultInjector()
+    model = StubStructuredModel(injector)
+    tavily_client = StubTavilyClient(injector)
+
+    ai_service.get_model = lambda: model
+    web_search.get_tavily_client = lambda: tavily_client
+    chat_service.create_chat = lambda medicine_information: StubChat(injector, medicine_information)
+    print(f"Fault stubs installed (latency={injector.latency}s, error_rate={injector.error_rate})")
@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+from config.load_env import (
+    GEMINI_TIMEOUT,
+    GEMINI_RATE_PER_SECOND,
+    GEMINI_BURST,
+    GEMINI_SLOW_CALL_SECONDS,
+    TAVILY_TIMEOUT,
+    TAVILY_RATE_PER_SECOND,
+    TAVILY_BURST,
+    TAVILY_SLOW_CALL_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+)
+from metrics import registry, Counter, Gauge, track_external, traced
+
+external_calls_failed_total = registry.register(Counter(
+    "external_calls_failed_total", "External calls that failed, timed out or were skipped, by reason",
+    ("provider", "reason")))
+external_circuit_state = registry.register(Gauge(
+    "external_circuit_state", "Circuit breaker state per provider (0 closed, 1 half-open, 2 open)",
+    ("provider",)))
+
+# Absolute monotonic deadline of the current request, None when unbounded
+_request_deadline = ContextVar("request_deadline", default=None)
+
+# Calls run here so a hung SDK call can be abandoned once its deadline passes
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="external-call")
+
+
+class ExternalServiceError(Exception):
+    """An external AI/search call was not completed"""
+
+    reason = "error"
+
+    def __init__(self, provider, message):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+
+
+class ProviderError(ExternalServiceError):
+    reason = "provider_error"
+
+
+class CircuitOpenError(ExternalServiceError):
+    reason = "circuit_open"
+
+
+class RateLimitedError(ExternalServiceError):
+    reason = "rate_limited"
+
+
+class DeadlineExceededError(ExternalServiceError):
+    reason = "deadline"
+
+
+@contextmanager
+def request_budget(seconds):
+    """Bound the total time external calls may take within this block"""
+    token = _request_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_budget():
+    """Seconds left in the current request budget, or None when unbounded"""
+    deadline = _request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout):
+        """Take a token, waiting at most `timeout` seconds; returns False on timeout"""
+        give_up_at = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > give_up_at:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures or slow calls, then
+    lets a single trial call through once `reset_timeout` seconds have passed.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, failure_threshold, reset_timeout, slow_call_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the trial call still in flight
+            return False
+
+    def release(self):
+        """Give back an unused half-open trial slot"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record(self, succeeded, duration):
+        with self._lock:
+            if succeeded and duration < self.slow_call_seconds:
+                self._failures = 0
+                self.state = self.CLOSED
+                return
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class Provider:
+    """Deadline, rate limit and circuit breaker around one external service"""
+
+    def __init__(self, name, timeout, rate, burst, slow_call_seconds):
+        self.name = name
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT, slow_call_seconds)
+        registry.add_collector(lambda: external_circuit_state.set(self.breaker.state, self.name))
+
+    def call(self, operation, fn, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` within the provider's limits or raise ExternalServiceError"""
+        try:
+            return self._call(operation, fn, *args, **kwargs)
+        except ExternalServiceError as e:
+            external_calls_failed_total.inc(self.name, e.reason)
+            raise
+
+    def _call(self, operation, fn, *args, **kwargs):
+        remaining = remaining_budget()
+        timeout = self.timeout if remaining is None else min(self.timeout, remaining)
+        if timeout <= 0:
+            raise DeadlineExceededError(self.name, "request budget exhausted")
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name, "circuit open, skipping call")
+
+        started = time.monotonic()
+        if not self.bucket.acquire(timeout):
+            # Never reached the provider, so a half-open trial is handed back unused
+            self.breaker.release()
+            raise RateLimitedError(self.name, "rate limit exceeded")
+
+        succeeded = False
+        try:
+            with track_external(self.name, operation):
+                future = _executor.submit(copy_context().run, traced(fn), *args, **kwargs)
+                try:
+                    result = future.result(timeout=max(timeout - (time.monotonic() - started), 0))
+                except FutureTimeoutError:
+                    future.cancel()
+                    raise DeadlineExceededError(self.name, f"{operation} timed out after {timeout:.1f}s")
+                except Exception as e:
+                    raise ProviderError(self.name, f"{operation} failed: {e}") from e
+            succeeded = True
+            return result
+        finally:
+            self.breaker.record(succeeded, time.monotonic() - started)
+
+
+gemini = Provider("gemini", GEMINI_TIMEOUT, GEMINI_RATE_PER_SECOND, GEMINI_BURST, GEMINI_SLOW_CALL_SECONDS)
+tavily = Provider("tavily", TAVILY_TIMEOUT, TAVILY_RATE_PER_SECOND, TAVILY_BURST, TAVILY_SLOW_CALL_SECONDS)
@@ -1,7 +1,19 @@
+from functools import lru_cache
 
-from tavily import TavilyClient
 from rapidfuzz import fuzz
 from config.load_env import TAVILY_API_KEY
+from services.resilience import tavily
+
+
+@lru_cache(maxsize=None)
+def get_tavily_client():
+    """
+    Shared Tavily client; the SDK is only imported when a search is made.
+    """
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=TAVILY_API_KEY)
+
 
 def calculate_similarity(source_text: str, target_text: str) -> float:
     """
@@ -33,9 +45,14 @@ def find_best_medicine_match(
 
     Returns:
         str: The best matching medicine name or 'Not found' if no match exceeds the threshold.
+
+    Raises:
+        ExternalServiceError: If the search is skipped or abandoned (deadline, rate limit, open circuit).
     """
-    tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
-    search_response = tavily_client.search(
+    tavily_client = get_tavily_client()
+    search_response = tavily.call(
+        "search",
+        tavily_client.search,
         query=search_text,
         max_results=20,
         country="Bangladesh"
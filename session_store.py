@@ -0,0 +1,137 @@
+"""
+Session-scoped storage for prescription context.
+
+Each browser gets a random session cookie; the prescription extracted by
+/explain-image/ is stored under that id and read back by the chatbot, so
+concurrent users (and multiple uvicorn workers, with the SQLite backend)
+never see each other's prescriptions.
+"""
+
+import json
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from config.load_env import SESSION_STORE, SESSION_DB_PATH, SESSION_TTL
+
+SESSION_COOKIE = "medscribe_session"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32,64}$")
+
+
+class MemoryContextStore:
+    """In-process LRU store with per-entry TTL (single worker only)"""
+
+    def __init__(self, ttl=SESSION_TTL, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            return value
+
+    def set(self, session_id, value):
+        with self._lock:
+            self._entries[session_id] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+
+class SQLiteContextStore:
+    """SQLite-backed store shared by every worker process on the host"""
+
+    PURGE_EVERY = 100
+
+    def __init__(self, path=SESSION_DB_PATH, ttl=SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_context ("
+                "session_id TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        row = self._connection().execute(
+            "SELECT value FROM session_context WHERE session_id = ? AND expires_at > ?",
+            (session_id, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, session_id, value):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO session_context (session_id, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (session_id, json.dumps(value), now + self.ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM session_context WHERE expires_at <= ?", (now,))
+
+    def delete(self, session_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM session_context WHERE session_id = ?", (session_id,))
+
+
+@lru_cache(maxsize=None)
+def get_context_store():
+    """Store selected by SESSION_STORE ("memory" or "sqlite")"""
+    if SESSION_STORE == "sqlite":
+        return SQLiteContextStore()
+    if SESSION_STORE != "memory":
+        raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
+    return MemoryContextStore()
+
+
+def get_session_id(request):
+    """Session id from the request cookie, or None if missing or malformed"""
+    session_id = request.cookies.get(SESSION_COOKIE)
+    if session_id and SESSION_ID_PATTERN.match(session_id):
+        return session_id
+    return None
+
+
+def ensure_session_id(request, response):
+    """Return the request's session id, issuing a new cookie if it has none"""
+    session_id = get_session_id(request)
+    if session_id is None:
+        session_id = secrets.token_urlsafe(32)
+        response.set_cookie(
+            SESSION_COOKIE,
+            session_id,
+            max_age=int(SESSION_TTL),
+            httponly=True,
+            samesite="lax",
+        )
+    return session_id
@@ -52,6 +52,18 @@ class MedicineInventory {
         });
     }
     
+    updateFacetCounts(elementId, facetCounts) {
+        if (!facetCounts) return;
+        
+        const counts = new Map(facetCounts.map(facet => [facet.value, facet.count]));
+        const select = document.getElementById(elementId);
+        Array.from(select.options).forEach(option => {
+            if (option.value) {
+                option.textContent = `${option.value} (${counts.get(option.value) || 0})`;
+            }
+        });
+    }
+    
     async loadStatistics() {
         try {
             const response = await fetch('/api/statistics');
@@ -101,7 +113,8 @@ class MedicineInventory {
                 search_type: this.filters.search_type, // Include search type
                 ...(this.filters.query && { query: this.filters.query }),
                 ...(this.filters.type && { type: this.filters.type }),
-                ...(this.filters.dosage_form && { dosage_form: this.filters.dosage_form })
+                ...(this.filters.dosage_form && { dosage_form: this.filters.dosage_form }),
+                facets: 'type,dosage_form'
             });
             
             const response = await fetch(`/api/medicines/search?${params}`);
@@ -112,6 +125,11 @@ class MedicineInventory {
             this.totalResults = data.total;
             this.currentPage = data.page;
             
+            if (data.facets) {
+                this.updateFacetCounts('type-filter', data.facets.type);
+                this.updateFacetCounts('dosage-filter', data.facets.dosage_form);
+            }
+            
             this.renderMedicines();
             this.updatePagination();
             this.hideLoading();
@@ -0,0 +1,147 @@
+"""
+Serving side of the static asset pipeline (see build_assets.py).
+
+- asset_url() maps "js/main.js" to its fingerprinted copy in static/dist
+  when the build manifest exists, falling back to the plain file.
+- PrecompressedStaticFiles serves the .br / .gz variant the client accepts
+  and marks fingerprinted files immutable; everything else is revalidated.
+- StaticPageCache renders data-free templates once and serves them (with
+  precompressed variants and an ETag) without touching Jinja again.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from functools import lru_cache
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+import brotli
+
+STATIC_DIR = "static"
+STATIC_URL = "/static"
+DIST_DIR = "dist"
+MANIFEST_PATH = os.path.join(STATIC_DIR, DIST_DIR, "manifest.json")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred first when the client accepts both
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+@lru_cache(maxsize=None)
+def load_manifest():
+    """Source path -> fingerprinted path, or {} when assets haven't been built"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(path):
+    """URL for a file under static/, fingerprinted when a build is available"""
+    hashed_path = load_manifest().get(path)
+    if hashed_path is None:
+        return f"{STATIC_URL}/{path}"
+    return f"{STATIC_URL}/{DIST_DIR}/{hashed_path}"
+
+
+def accepted_encodings(accept_encoding):
+    """Content codings the client accepts (q > 0), from an Accept-Encoding header"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that negotiates precompressed variants and long-lived caching"""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        fingerprinted = relative_path.startswith(f"{DIST_DIR}/") and relative_path != f"{DIST_DIR}/manifest.json"
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if fingerprinted else REVALIDATE_CACHE_CONTROL}
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        has_variants = False
+        for coding, suffix in ENCODINGS:
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            has_variants = True
+            if coding in accepted or "*" in accepted:
+                full_path, stat_result = f"{full_path}{suffix}", variant_stat
+                headers["Content-Encoding"] = coding
+                break
+        if has_variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class StaticPageCache:
+    """Rendered HTML for templates that take no data, with compressed variants"""
+
+    def __init__(self, templates, enabled=True):
+        self.templates = templates
+        self.enabled = enabled
+        self._pages = {}
+
+    def response(self, request, template_name):
+        if not self.enabled:
+            return self.templates.TemplateResponse(template_name, {"request": request})
+
+        page = self._pages.get(template_name)
+        if page is None:
+            page = self._pages[template_name] = self._render(request, template_name)
+
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        coding = "identity"
+        for candidate, _ in ENCODINGS:
+            if candidate in page and (candidate in accepted or "*" in accepted):
+                coding = candidate
+                break
+
+        # Each encoding is a distinct representation, so each gets its own ETag
+        etag = f'"{page["digest"]}-{coding}"'
+        headers = {"Cache-Control": REVALIDATE_CACHE_CONTROL, "ETag": etag, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(page[coding], media_type="text/html", headers=headers)
+
+    def _render(self, request, template_name):
+        body = self.templates.get_template(template_name).render(request=request).encode("utf-8")
+        page = {
+            "identity": body,
+            "digest": hashlib.sha256(body).hexdigest()[:16],
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            "br": brotli.compress(body, quality=11),
+        }
+        return page
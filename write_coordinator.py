@@ -0,0 +1,138 @@
+"""
+Group commit for single-item catalog writes.
+
+SQLite allows one writer at a time and every commit pays for its own fsync,
+so many small concurrent edits queue up behind each other (and surface as
+"database is locked"). Writes submitted here are collected by one writer
+thread for up to WRITE_BATCH_WINDOW_MS or WRITE_BATCH_MAX_OPS operations and
+committed together. Each operation runs inside its own SAVEPOINT, so one
+failing operation is rolled back and reported to its caller without
+affecting the rest of the batch.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config.load_env import WRITE_BATCH_WINDOW_MS, WRITE_BATCH_MAX_OPS
+from database import SessionLocal, BEGIN_IMMEDIATE
+from metrics import registry, Counter, Histogram, COUNT_BUCKETS
+from search_cache import search_cache
+
+write_batch_size = registry.register(Histogram(
+    "db_write_batch_size", "Operations committed per write batch", buckets=COUNT_BUCKETS))
+write_operations_total = registry.register(Counter(
+    "db_write_operations_total", "Coalesced write operations by result", ("result",)))
+
+_STOP = object()
+
+
+class WriteCoordinator:
+    """Single writer thread that commits queued operations in batches"""
+
+    def __init__(self, session_factory, window=WRITE_BATCH_WINDOW_MS / 1000, max_ops=WRITE_BATCH_MAX_OPS):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_ops = max(1, max_ops)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="write-coordinator", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=10.0):
+        """Flush everything already queued, then stop the writer thread"""
+        with self._lock:
+            if self.running:
+                self._queue.put(_STOP)
+                self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, operation, *args):
+        """
+        Queue `operation(db, *args)` and return a Future for its result. The
+        operation must only stage changes (it may flush, never commit).
+        """
+        if not self.running:
+            raise RuntimeError("Write coordinator is not running")
+        future = Future()
+        self._queue.put((operation, args, future))
+        return future
+
+    async def run(self, operation, *args):
+        """submit() for async callers"""
+        return await asyncio.wrap_future(self.submit(operation, *args))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            flush_at = time.monotonic() + self.window
+            while len(batch) < self.max_ops:
+                remaining = flush_at - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        results = []
+        db = None
+        try:
+            db = self.session_factory()
+            # Fails with "database is locked" once busy_timeout runs out
+            db.connection(execution_options=BEGIN_IMMEDIATE)
+            for operation, args, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with db.begin_nested():
+                        result = operation(db, *args)
+                except Exception as e:
+                    write_operations_total.inc("error")
+                    future.set_exception(e)
+                    continue
+                results.append((future, result))
+            db.commit()
+        except Exception as e:
+            # Nothing in the batch was committed: fail every caller still waiting
+            for _, _, future in batch:
+                if not future.done():
+                    write_operations_total.inc("error")
+                    future.set_exception(e)
+            if db is not None:
+                try:
+                    db.rollback()
+                except Exception as rollback_error:
+                    print(f"Write batch rollback failed: {rollback_error}")
+            return
+        finally:
+            if db is not None:
+                db.close()
+
+        write_batch_size.observe(len(results))
+        if results:
+            search_cache.invalidate()
+        for future, result in results:
+            write_operations_total.inc("ok")
+            future.set_result(result)
+
+write_coordinator = WriteCoordinator(SessionLocal)